@@ -13,12 +13,46 @@ from pathlib import Path
 from typing import Optional
 
 
-def setup_audit_logger(script_name: str, audit_file: Optional[str] = None) -> logging.Logger:
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches writes instead of flushing every record.
+    
+    logging.FileHandler flushes after each record, costing one write() per
+    audit line. This handler lets records collect in a ``buffer_size`` byte
+    file buffer and only flushes on its own for ERROR records, so failures
+    reach disk immediately. Call flush_audit_log() at checkpoints (e.g. after
+    each database commit); the buffer is also flushed when the handler closes.
+    """
+    
+    def __init__(self, filename, buffer_size: int = 1 << 20, encoding: str = 'utf-8'):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode='a', encoding=encoding)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def setup_audit_logger(script_name: str, audit_file: Optional[str] = None,
+                       buffered: bool = False) -> logging.Logger:
     """Setup audit logger for a script.
     
     Args:
         script_name: Name of the script (e.g., 'index_media', 'move_media')
         audit_file: Path to audit log file. If None, uses default location.
+        buffered: Batch writes with BufferedFileHandler instead of flushing
+            every record. Callers must call flush_audit_log() at checkpoints.
     
     Returns:
         Configured logger instance
@@ -40,7 +74,10 @@ def setup_audit_logger(script_name: str, audit_file: Optional[str] = None) -> lo
     logger.handlers.clear()
     
     # Create file handler (append mode)
-    file_handler = logging.FileHandler(audit_file, mode='a', encoding='utf-8')
+    if buffered:
+        file_handler = BufferedFileHandler(audit_file, encoding='utf-8')
+    else:
+        file_handler = logging.FileHandler(audit_file, mode='a', encoding='utf-8')
     file_handler.setLevel(logging.INFO)
     
     # Create formatter
@@ -60,6 +97,16 @@ def setup_audit_logger(script_name: str, audit_file: Optional[str] = None) -> lo
     return logger
 
 
+def flush_audit_log(logger: logging.Logger):
+    """Write any buffered audit records to disk.
+    
+    Args:
+        logger: Audit logger
+    """
+    for handler in logger.handlers:
+        handler.flush()
+
+
 def log_session_start(logger: logging.Logger, script_name: str, args: dict):
     """Log the start of a script session.
     
@@ -199,7 +246,8 @@ def log_skip(logger: logging.Logger, file_path: str, reason: str, details: Optio
 
 
 # Convenience function for scripts
-def get_audit_logger(script_name: str, audit_file: Optional[str] = None) -> logging.Logger:
+def get_audit_logger(script_name: str, audit_file: Optional[str] = None,
+                     buffered: bool = False) -> logging.Logger:
     """Get or create audit logger for a script.
     
     This is the main entry point for scripts to get an audit logger.
@@ -207,6 +255,7 @@ def get_audit_logger(script_name: str, audit_file: Optional[str] = None) -> logg
     Args:
         script_name: Name of the script (e.g., 'index_media')
         audit_file: Optional custom audit file path
+        buffered: Batch audit writes (see setup_audit_logger)
     
     Returns:
         Configured audit logger
@@ -217,4 +266,4 @@ def get_audit_logger(script_name: str, audit_file: Optional[str] = None) -> logg
         audit_log = get_audit_logger('my_script')
         log_session_start(audit_log, 'my_script', vars(args))
     """
-    return setup_audit_logger(script_name, audit_file)
+    return setup_audit_logger(script_name, audit_file, buffered)
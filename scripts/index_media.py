@@ -48,7 +48,8 @@ def get_exif_data(filepath: str) -> Optional[Dict]:
     """Extract EXIF data from an image file using exiftool."""
     try:
         cmd = ["exiftool", "-json", "-G", filepath]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Keep stdout as bytes; json.loads decodes UTF-8 itself
+        result = subprocess.run(cmd, capture_output=True, check=True)
         data = json.loads(result.stdout)
         if data and isinstance(data, list) and len(data) > 0:
             return data[0]
@@ -58,6 +59,37 @@ def get_exif_data(filepath: str) -> Optional[Dict]:
         return None
 
 
+# Normalized field -> exiftool tags to try, in order of preference
+TAG_ALIASES = {
+    'date_taken': ('EXIF:DateTimeOriginal', 'EXIF:CreateDate', 'XMP:DateCreated', 'IPTC:DateCreated'),
+    'lens_model': ('EXIF:LensModel', 'XMP:LensModel', 'EXIF:LensInfo'),
+    'latitude': ('EXIF:GPSLatitude', 'Composite:GPSLatitude'),
+    'longitude': ('EXIF:GPSLongitude', 'Composite:GPSLongitude'),
+    'altitude': ('EXIF:GPSAltitude', 'Composite:GPSAltitude'),
+    'city': ('XMP-photoshop:City', 'IPTC:City', 'XMP:City'),
+    'state': ('XMP-photoshop:State', 'IPTC:Province-State', 'XMP:State'),
+    'country': ('XMP-photoshop:Country', 'IPTC:Country-PrimaryLocationName', 'XMP:Country'),
+    'country_code': ('XMP-iptcExt:LocationShownCountryCode', 'IPTC:Country-PrimaryLocationCode'),
+    'coverage': ('XMP-dc:Coverage', 'XMP:Coverage', 'Coverage'),
+    'caption': ('IPTC:Caption-Abstract', 'XMP:Description', 'EXIF:ImageDescription'),
+    'keywords': ('XMP-dc:Subject', 'IPTC:Keywords', 'XMP:Subject'),
+}
+
+
+def _resolve(exif: Dict, field: str):
+    """Return the first non-empty value among ``field``'s aliases.
+
+    Like chaining ``exif.get(a) or exif.get(b) ...``: if every alias is empty,
+    the last one's value is returned.
+    """
+    value = None
+    for tag in TAG_ALIASES[field]:
+        value = exif.get(tag)
+        if value:
+            break
+    return value
+
+
 def normalize_exif_data(exif: Dict) -> Dict:
     """Extract and normalize relevant fields from raw EXIF data."""
     normalized = {}
@@ -70,11 +102,8 @@ def normalize_exif_data(exif: Dict) -> Dict:
                            exif.get('File:ImageHeight') or 
                            exif.get('Composite:ImageSize', '').split('x')[1] if 'x' in str(exif.get('Composite:ImageSize', '')) else None)
     
-    # Date taken - try multiple fields
-    normalized['date_taken'] = (exif.get('EXIF:DateTimeOriginal') or 
-                               exif.get('EXIF:CreateDate') or 
-                               exif.get('XMP:DateCreated') or 
-                               exif.get('IPTC:DateCreated'))
+    # Date taken
+    normalized['date_taken'] = _resolve(exif, 'date_taken')
     
     # Camera settings
     normalized['exposure_time'] = exif.get('EXIF:ExposureTime')
@@ -86,14 +115,12 @@ def normalize_exif_data(exif: Dict) -> Dict:
     # Camera and lens
     normalized['camera_make'] = exif.get('EXIF:Make')
     normalized['camera_model'] = exif.get('EXIF:Model')
-    normalized['lens_model'] = (exif.get('EXIF:LensModel') or 
-                               exif.get('XMP:LensModel') or 
-                               exif.get('EXIF:LensInfo'))
+    normalized['lens_model'] = _resolve(exif, 'lens_model')
     
     # GPS data
-    gps_lat = exif.get('EXIF:GPSLatitude') or exif.get('Composite:GPSLatitude')
-    gps_lon = exif.get('EXIF:GPSLongitude') or exif.get('Composite:GPSLongitude')
-    gps_alt = exif.get('EXIF:GPSAltitude') or exif.get('Composite:GPSAltitude')
+    gps_lat = _resolve(exif, 'latitude')
+    gps_lon = _resolve(exif, 'longitude')
+    gps_alt = _resolve(exif, 'altitude')
     
     if gps_lat:
         normalized['latitude'] = _parse_gps_coordinate(gps_lat)
@@ -103,29 +130,13 @@ def normalize_exif_data(exif: Dict) -> Dict:
         normalized['altitude'] = _parse_altitude(gps_alt)
     
     # Location information
-    normalized['city'] = (exif.get('XMP-photoshop:City') or 
-                         exif.get('IPTC:City') or 
-                         exif.get('XMP:City'))
-    normalized['state'] = (exif.get('XMP-photoshop:State') or 
-                          exif.get('IPTC:Province-State') or 
-                          exif.get('XMP:State'))
-    normalized['country'] = (exif.get('XMP-photoshop:Country') or 
-                            exif.get('IPTC:Country-PrimaryLocationName') or 
-                            exif.get('XMP:Country'))
-    normalized['country_code'] = (exif.get('XMP-iptcExt:LocationShownCountryCode') or 
-                                 exif.get('IPTC:Country-PrimaryLocationCode'))
-    normalized['coverage'] = (exif.get('XMP-dc:Coverage') or 
-                             exif.get('XMP:Coverage') or 
-                             exif.get('Coverage'))
+    for field in ('city', 'state', 'country', 'country_code', 'coverage'):
+        normalized[field] = _resolve(exif, field)
     
     # Caption and keywords
-    normalized['caption'] = (exif.get('IPTC:Caption-Abstract') or 
-                            exif.get('XMP:Description') or 
-                            exif.get('EXIF:ImageDescription'))
+    normalized['caption'] = _resolve(exif, 'caption')
     
-    keywords = (exif.get('XMP-dc:Subject') or 
-               exif.get('IPTC:Keywords') or 
-               exif.get('XMP:Subject'))
+    keywords = _resolve(exif, 'keywords')
     if keywords:
         if isinstance(keywords, list):
             # Convert all items to strings before joining
@@ -203,7 +214,7 @@ def get_video_metadata(filepath: str) -> Optional[Dict]:
             "-show_format",
             filepath
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = subprocess.run(cmd, capture_output=True, check=True)
         data = json.loads(result.stdout)
         
         metadata = {}
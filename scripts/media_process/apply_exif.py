@@ -11,11 +11,16 @@ Features:
 """
 
 import argparse
+import contextlib
+import functools
 import glob
 import os
+import re
 import shlex
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
 import yaml
@@ -30,6 +35,13 @@ try:
 except ImportError:
     LOCATION_AVAILABLE = False
 
+# Optional faster JSON parser for exiftool output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ---------------- CONFIG ----------------
 # Existing pattern‑to‑tag mapping retained for backward compatibility.
 PATTERN_TAG_MAP = {
@@ -37,8 +49,16 @@ PATTERN_TAG_MAP = {
 
 # Default tag name used by the original script.
 DEFAULT_TAG_NAME = "XMP-dc:Subject"
+
+# Persistent cache of geocoded place names (set to None to disable).
+GEOCODE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "apply_exif", "geocode.json")
+# Bump when the cached location tags change shape; older files are then ignored.
+GEOCODE_CACHE_VERSION = 1
 # ----------------------------------------
 
+# Lazily loaded contents of GEOCODE_CACHE_FILE
+_geocode_disk_cache = None
+
 
 def load_yaml_tags(path: str) -> dict:
     """Load a YAML file containing a mapping of tag names to values.
@@ -114,12 +134,330 @@ def build_exiftool_cmd(files: list, tags: dict, dry_run: bool) -> list:
     return cmd
 
 
-def run_exiftool(files: list, tags: dict, dry_run: bool, verbose: int = 0):
-    """Execute the exiftool with the given files and tags."""
+@functools.lru_cache(maxsize=64)
+def _cached_tag_args(tags_key: tuple, dry_run: bool) -> tuple:
+    """Memoized tag/option portion of ``build_exiftool_cmd`` (no files)."""
+    tags = {name: list(value) if is_list else value for name, is_list, value in tags_key}
+    return tuple(build_exiftool_cmd([], tags, dry_run))
+
+
+def _build_exiftool_cmd_cached(files: list, tags: dict, dry_run: bool) -> list:
+    """``build_exiftool_cmd`` reusing the tag arguments for repeated tag sets.
+
+    ``main`` writes the same tags to every file unless keywords are edited
+    per file, so the tag arguments only need to be built once per run.
+    Scalar values are keyed by their string form, which is what ends up in
+    the argument: ``True``, ``1`` and ``1.0`` compare equal but write
+    different values.
+    """
+    try:
+        tags_key = tuple(
+            (name, isinstance(value, list), tuple(value) if isinstance(value, list) else str(value))
+            for name, value in tags.items()
+        )
+        return list(_cached_tag_args(tags_key, dry_run)) + list(files)
+    except TypeError:
+        # Unhashable tag value; build without the cache
+        return build_exiftool_cmd(files, tags, dry_run)
+
+
+def _argfile_line(arg: str) -> str:
+    """Format one argument for exiftool's ``-@`` argfile protocol.
+
+    Arguments are newline-delimited, so values that contain line breaks (e.g.
+    the ``-sep "\\n"`` keyword lists from ``build_exiftool_cmd``) are sent as
+    ``#[CSTR]`` lines, which exiftool unescapes like a C string.
+    """
+    if "\n" in arg or "\r" in arg:
+        escaped = arg.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+        return "#[CSTR]" + escaped
+    return arg
+
+
+# Keyword lookups only need XMP/IPTC, which JPEG and TIFF keep in header
+# segments, so exiftool can skip trailer scanning and maker notes there. Other
+# formats must be read in full: -fast2 stops at a QuickTime mdat atom, and
+# phone/camera MOV/MP4 files often store moov (and their XMP) after it.
+_FAST_READ = "-fast2"
+_FAST_READ_EXTENSIONS = frozenset({".jpg", ".jpeg", ".tif", ".tiff"})
+
+
+def _fast_read_args(file_paths) -> list:
+    """Return ``[_FAST_READ]`` if every file is a JPEG or TIFF, else ``[]``."""
+    if all(os.path.splitext(path)[1].lower() in _FAST_READ_EXTENSIONS for path in file_paths):
+        return [_FAST_READ]
+    return []
+
+# Commands longer than this are passed to exiftool as an argfile on stdin
+# instead of argv (Windows caps a command line at 32767 characters).
+_ARGV_MAX_CHARS = 32000
+
+
+def _argv_or_argfile(cmd: list) -> tuple:
+    """Return ``(argv, stdin_text)`` for running ``cmd`` with subprocess.
+
+    Commands over ``_ARGV_MAX_CHARS`` are rewritten to ``exiftool -@ -`` with
+    the arguments supplied as an argfile on stdin.
+    """
+    if sum(len(arg) + 1 for arg in cmd) <= _ARGV_MAX_CHARS:
+        return cmd, None
+    return [cmd[0], "-@", "-"], "".join(_argfile_line(arg) + "\n" for arg in cmd[1:])
+
+
+class ExifToolSessionError(RuntimeError):
+    """The session's exiftool process exited while a command was running."""
+
+
+class ExifToolSession:
+    """A persistent ``exiftool -stay_open True -@ -`` process.
+
+    Every ``exiftool`` invocation pays for a Perl interpreter start-up, which
+    dominates the cost of reading or writing a handful of tags. A session keeps
+    one process alive and feeds it commands over stdin, each terminated with
+    ``-execute``; the response is read back up to the ``{readyN}`` sentinel.
+
+    Usage::
+
+        with ExifToolSession() as et:
+            run_exiftool([path], tags, dry_run=False, session=et)
+            keywords = get_existing_keywords(path, session=et)
+    """
+
+    def __init__(self, executable: str = "exiftool"):
+        self._executable = executable
+        self._start()
+
+    def _start(self):
+        try:
+            self._proc = subprocess.Popen(
+                [self._executable, "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise RuntimeError("exiftool not found") from e
+        self._counter = 0
+        # Output not yet consumed by a response, per stream, filled by one
+        # reader thread each so neither pipe can fill up while the other is
+        # being waited on
+        self._output = {"stdout": bytearray(), "stderr": bytearray()}
+        self._closed_streams = set()
+        self._output_ready = threading.Condition()
+        self._readers = [
+            threading.Thread(target=self._drain, args=(name, stream), daemon=True)
+            for name, stream in (("stdout", self._proc.stdout), ("stderr", self._proc.stderr))
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def execute(self, args: list, timeout: float = None) -> tuple:
+        """Run one exiftool command in the session.
+
+        Args:
+            args: exiftool arguments, without the leading ``exiftool``
+            timeout: Seconds to wait for the response, or None for no limit.
+                On expiry the exiftool process is killed and a fresh one
+                started, so the session stays usable.
+
+        If exiftool has exited, a fresh process is started and the command
+        retried once. Tag assignments are absolute, so running a write again
+        is harmless.
+
+        Returns:
+            Tuple of (stdout, stderr) as strings
+
+        Raises:
+            subprocess.TimeoutExpired: If ``timeout`` passed without a response
+            ExifToolSessionError: If exiftool also exited on the retry
+        """
+        if self._proc is None:
+            raise RuntimeError("exiftool session is closed")
+        try:
+            return self._execute_once(args, timeout)
+        except ExifToolSessionError:
+            self.restart()
+            return self._execute_once(args, timeout)
+
+    def _execute_once(self, args: list, timeout: float = None) -> tuple:
+        payload, sentinel = self._encode(args)
+        try:
+            self._proc.stdin.write(payload)
+            self._proc.stdin.flush()
+        except OSError as e:  # BrokenPipeError once exiftool has exited
+            raise ExifToolSessionError("exiftool session terminated unexpectedly") from e
+        deadline = None if timeout is None else time.monotonic() + timeout
+        response = self._read_response(sentinel, deadline)
+        if response is None:
+            # The stuck command would block every later one; start over
+            self.restart()
+            raise subprocess.TimeoutExpired(["exiftool"] + [str(a) for a in args], timeout)
+        return response
+
+    def execute_many(self, commands: list) -> list:
+        """Run several exiftool commands in one round trip.
+
+        Every command is queued as its own numbered ``-execute`` block before
+        any response is read, and exiftool runs them in order. Interleaving
+        writes and reads of the same file is therefore safe.
+
+        Args:
+            commands: List of argument lists, as for ``execute``
+
+        Returns:
+            List of (stdout, stderr) tuples, one per command
+        """
+        if self._proc is None:
+            raise RuntimeError("exiftool session is closed")
+        encoded = [self._encode(args) for args in commands]
+        payload = b"".join(chunk for chunk, _ in encoded)
+        # Write from a helper thread: with a large batch exiftool can fill its
+        # output pipes before it has read all of stdin.
+        writer = threading.Thread(target=self._write, args=(payload,), daemon=True)
+        writer.start()
+        try:
+            try:
+                return [self._read_response(sentinel) for _, sentinel in encoded]
+            finally:
+                writer.join()
+        except ExifToolSessionError:
+            # Part of the batch may have run, so it is not retried; just
+            # leave a live process for the next call
+            self.restart()
+            raise
+
+    def _encode(self, args: list) -> tuple:
+        """Return the argfile bytes for one command and its sentinel."""
+        self._counter += 1
+        sentinel = f"{{ready{self._counter}}}"
+        lines = [_argfile_line(str(a)) for a in args]
+        # -echo4 writes the sentinel to stderr once the command has finished,
+        # so both streams can be read up to a known terminator.
+        lines += ["-echo4", sentinel, f"-execute{self._counter}"]
+        return ("\n".join(lines) + "\n").encode("utf-8"), sentinel
+
+    def _write(self, payload: bytes):
+        try:
+            self._proc.stdin.write(payload)
+            self._proc.stdin.flush()
+        except OSError:
+            pass  # exiftool died; the reader reports it
+
+    def _drain(self, name: str, stream):
+        """Reader thread: append ``stream``'s output until exiftool closes it."""
+        fd = stream.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except OSError:
+                chunk = b""
+            with self._output_ready:
+                if chunk:
+                    self._output[name] += chunk
+                else:
+                    self._closed_streams.add(name)
+                self._output_ready.notify_all()
+            if not chunk:
+                return
+
+    def _read_response(self, sentinel: str, deadline: float = None):
+        """Wait until both streams hold ``sentinel`` and return what precedes it.
+
+        Returns None if ``deadline`` (a ``time.monotonic()`` value) passes first.
+        """
+        response = {}
+        with self._output_ready:
+            while True:
+                for name in ("stdout", "stderr"):
+                    if name not in response:
+                        output = self._take_until(self._output[name], sentinel)
+                        if output is not None:
+                            response[name] = output
+                if len(response) == 2:
+                    return response["stdout"], response["stderr"]
+                if self._closed_streams.difference(response):
+                    raise ExifToolSessionError("exiftool session terminated unexpectedly")
+                if deadline is None:
+                    self._output_ready.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._output_ready.wait(remaining)
+
+    @staticmethod
+    def _take_until(buf: bytearray, sentinel: str):
+        """Remove and return ``buf``'s text before the line that is exactly ``sentinel``.
+
+        Anything after that line belongs to the next pipelined command and is
+        left in ``buf``. Returns None if the sentinel line is not complete yet.
+        """
+        marker = sentinel.encode("utf-8")
+        idx = buf.find(marker)
+        while idx != -1:
+            end = idx + len(marker)
+            # The sentinel line ends in "\n" ("\r\n" on Windows)
+            eol = end + 1 if buf[end:end + 2] == b"\r\n" else end
+            if idx == 0 or buf[idx - 1] == 0x0A:
+                if eol >= len(buf):
+                    return None  # Rest of the line has not arrived
+                if buf[eol] == 0x0A:
+                    output = buf[:idx].decode("utf-8", errors="replace")
+                    del buf[:eol + 1]
+                    return output
+            idx = buf.find(marker, idx + 1)
+        return None
+
+    def restart(self):
+        """Kill the exiftool process (if any) and start a fresh one."""
+        if self._proc is not None:
+            self._stop(kill=True)
+        self._start()
+
+    def close(self):
+        """Ask exiftool to exit and wait for it."""
+        if self._proc is None:
+            return
+        self._stop(kill=False)
+
+    def _stop(self, kill: bool):
+        try:
+            if kill:
+                self._proc.kill()
+                self._proc.wait()
+            else:
+                self._proc.stdin.write(b"-stay_open\nFalse\n")
+                self._proc.stdin.flush()
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+        finally:
+            for reader in self._readers:
+                reader.join(timeout=1)
+            with contextlib.suppress(OSError):
+                self._proc.stdin.close()
+            self._proc.stdout.close()
+            self._proc.stderr.close()
+            self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_exiftool(files: list, tags: dict, dry_run: bool, verbose: int = 0, session: ExifToolSession = None):
+    """Execute the exiftool with the given files and tags.
+
+    If ``session`` is given the command is sent to that persistent exiftool
+    process instead of spawning a new one.
+    """
     if verbose >= 2:
         print(f"[DEBUG] Building exiftool command for {len(files)} file(s) with {len(tags)} tag(s)")
     
-    cmd = build_exiftool_cmd(files, tags, dry_run)
+    cmd = _build_exiftool_cmd_cached(files, tags, dry_run)
     cmd_str = shlex.join(cmd)
     
     if verbose >= 1:
@@ -131,12 +469,20 @@ def run_exiftool(files: list, tags: dict, dry_run: bool, verbose: int = 0):
         print("Dry run: Command not executed.")
         return True
 
+    if session is not None:
+        return _run_exiftool_in_session(session, cmd, verbose)
+
     if verbose >= 2:
         print(f"[DEBUG] Executing exiftool subprocess...")
     
+    # Large batches go through "-@ -" so the file list can't overflow argv
+    run_cmd, run_input = _argv_or_argfile(cmd)
+    if run_input is not None and verbose >= 2:
+        print(f"[DEBUG] Passing arguments to exiftool via argfile on stdin")
+
     try:
         # Use subprocess.run for better error handling and capturing output.
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = subprocess.run(run_cmd, input=run_input, capture_output=True, text=True, check=True)
         
         if verbose >= 2:
             print(f"[DEBUG] Exiftool completed with return code: {result.returncode}")
@@ -179,33 +525,108 @@ def run_exiftool(files: list, tags: dict, dry_run: bool, verbose: int = 0):
         raise RuntimeError("exiftool not found") from e
 
 
-def get_existing_keywords(file_path: str) -> dict:
+# Matches exiftool's summary line when at least one file was written
+_UPDATED_RE = re.compile(r"\b[1-9]\d* image files? (?:updated|unchanged)")
+
+
+def _run_exiftool_in_session(session: ExifToolSession, cmd: list, verbose: int = 0):
+    """Send a write command built by ``build_exiftool_cmd`` to a session."""
+    if verbose >= 2:
+        print(f"[DEBUG] Sending command to persistent exiftool session...")
+
+    stdout, stderr = session.execute(cmd[1:])
+
+    if verbose >= 3:
+        print(f"[DEBUG] Exiftool stdout ({len(stdout)} chars):")
+        print(stdout)
+        print(f"[DEBUG] Exiftool stderr ({len(stderr)} chars):")
+        print(stderr)
+
+    # A stay_open process has no per-command exit status; exiftool reports
+    # failures as "Error:" lines and a zero "files updated" count instead.
+    if "Error" in stderr and not _UPDATED_RE.search(stdout):
+        print(f"Error executing exiftool: {stderr}", file=sys.stderr)
+        raise RuntimeError(f"exiftool failed: {stderr}")
+
+    if 'warning' in stderr.lower():
+        print("Exiftool stderr:", file=sys.stderr)
+        print(stderr, file=sys.stderr)
+    elif stdout.strip() and verbose >= 1:
+        print("[VERBOSE] Exiftool output:", stdout)
+
+    return True
+
+
+def _json_loads(data):
+    """Parse exiftool JSON output (str or bytes), using orjson when installed."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _read_tags_batch(file_paths: list, tags: list, session: ExifToolSession = None) -> dict:
+    """Read ``tags`` from many files with a single ``exiftool -G -json`` call.
+
+    Returns a dict mapping each path in ``file_paths`` to its JSON entry. Files
+    exiftool could not read are left out of the result.
+    """
+    if not file_paths:
+        return {}
+    cmd = (["exiftool"] + _fast_read_args(file_paths) + ["-G", "-json"]
+           + [f"-{tag}" for tag in tags] + list(file_paths))
+    if session is not None:
+        output, _ = session.execute(cmd[1:])
+    else:
+        # exiftool exits non-zero if any file failed, but still reports the rest.
+        # Output stays as bytes; the JSON parser decodes it directly.
+        run_cmd, run_input = _argv_or_argfile(cmd)
+        if run_input is not None:
+            run_input = run_input.encode("utf-8")
+        output = subprocess.run(run_cmd, input=run_input, capture_output=True).stdout
+    if not output.strip():
+        return {}
+
+    entries = {}
+    for entry in _json_loads(output):
+        source = entry.get("SourceFile")
+        if source:
+            entries[os.path.normpath(source)] = entry
+    return {path: entries[os.path.normpath(path)]
+            for path in file_paths if os.path.normpath(path) in entries}
+
+
+def _keywords_from_tags(file_tags: dict) -> dict:
+    """Extract normalized keyword lists from one ``exiftool -G -json`` entry."""
+    # Try multiple possible key names for compatibility
+    # exiftool with -G returns "XMP:Subject" not "XMP-dc:Subject"
+    subjects = (file_tags.get("XMP-dc:Subject") or 
+               file_tags.get("XMP:Subject") or 
+               file_tags.get("Subject", []))
+    iptc_keywords = (file_tags.get("IPTC:Keywords") or 
+                    file_tags.get("Keywords", []))
+    return {
+        "XMP-dc:Subject": _normalize_keywords(subjects),
+        "IPTC:Keywords": _normalize_keywords(iptc_keywords),
+    }
+
+
+def get_existing_keywords(file_path: str, session: ExifToolSession = None) -> dict:
     """Read existing XMP-dc:Subject and IPTC:Keywords from a file using exiftool.
 
     Returns a dictionary like {"XMP-dc:Subject": ["kw1", "kw2"], "IPTC:Keywords": ["kw1", "kw2"]}.
     """
     # Use -G flag to get group names in JSON output (e.g., "XMP:Subject" instead of just "Subject")
-    cmd = ["exiftool", "-G", "-json", "-XMP-dc:Subject", "-IPTC:Keywords", file_path]
+    cmd = (["exiftool"] + _fast_read_args([file_path])
+           + ["-G", "-json", "-XMP-dc:Subject", "-IPTC:Keywords", file_path])
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        if result.stdout:
-            data = json.loads(result.stdout)
+        if session is not None:
+            output, _ = session.execute(cmd[1:])
+        else:
+            output = subprocess.run(cmd, capture_output=True, check=True).stdout
+        if output:
+            data = _json_loads(output)
             if data and isinstance(data, list) and data[0]:
-                file_tags = data[0]
-                # Try multiple possible key names for compatibility
-                # exiftool with -G returns "XMP:Subject" not "XMP-dc:Subject"
-                subjects = (file_tags.get("XMP-dc:Subject") or 
-                           file_tags.get("XMP:Subject") or 
-                           file_tags.get("Subject", []))
-                iptc_keywords = (file_tags.get("IPTC:Keywords") or 
-                                file_tags.get("Keywords", []))
-                normalized = {
-                    "XMP-dc:Subject": _normalize_keywords(subjects),
-                    "IPTC:Keywords": _normalize_keywords(iptc_keywords),
-                }
-                return normalized
+                return _keywords_from_tags(data[0])
         return {"XMP-dc:Subject": [], "IPTC:Keywords": []}
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+    except (subprocess.CalledProcessError, json.JSONDecodeError, ExifToolSessionError) as e:
         print(f"Warning: Could not read existing keywords from {file_path}: {e}", file=sys.stderr)
         return {"XMP-dc:Subject": [], "IPTC:Keywords": []}
     except FileNotFoundError:
@@ -213,6 +634,29 @@ def get_existing_keywords(file_path: str) -> dict:
         sys.exit(1)
 
 
+def get_existing_keywords_batch(file_paths: list, session: ExifToolSession = None) -> dict:
+    """Read existing keywords for many files with one exiftool call.
+
+    Returns a dict mapping file path to the same structure as
+    ``get_existing_keywords``. Files that could not be read are omitted so the
+    caller can fall back to ``get_existing_keywords`` for them.
+    """
+    try:
+        entries = _read_tags_batch(file_paths, ["XMP-dc:Subject", "IPTC:Keywords"], session=session)
+    except json.JSONDecodeError:
+        # Leave error reporting to the per-file fallback
+        return {}
+    except (OSError, RuntimeError) as e:
+        if session is None:
+            return {}  # e.g. exiftool not installed; the fallback reports it
+        # The session's exiftool died (a BrokenPipeError is an OSError); give
+        # the per-file fallback and the writes after it a live process
+        print(f"Warning: exiftool session failed, restarting it: {e}", file=sys.stderr)
+        session.restart()
+        return {}
+    return {path: _keywords_from_tags(tags) for path, tags in entries.items()}
+
+
 def resolve_files(args) -> list:
     """Determine the list of image files to process based on arguments.
 
@@ -225,7 +669,7 @@ def resolve_files(args) -> list:
         # args.files is a list from action="append", may contain multiple entries
         # Ensure paths are absolute for consistency and remove duplicates
         resolved = [str(Path(p).resolve()) for p in args.files]
-        return sorted(list(set(resolved)))  # Remove duplicates and sort
+        return sorted(set(resolved))  # Remove duplicates and sort
     if args.pattern:
         return sorted(glob.glob(args.pattern, recursive=True))
     # Legacy mode – return an empty list; the caller will handle PATTERN_TAG_MAP.
@@ -285,18 +729,65 @@ def create_exif_metadata_from_manual_params(
     return metadata
 
 
-def create_exif_metadata(place_name: str, date_str: str = "", offset_str: str = "") -> dict:
-    """Generate EXIF/XMP metadata for a location and optional timestamp.
+def _load_geocode_cache() -> dict:
+    """Load the on-disk geocode cache (place name -> location tags).
 
-    Parameters:
-    - ``place_name``: Human‑readable location (required for location tags).
-    - ``date_str``:   Date/time in ``YYYY:MM:DD HH:MM:SS`` format (optional).
-    - ``offset_str``: UTC offset string like ``+05:30`` (optional).
+    A file written with a different ``GEOCODE_CACHE_VERSION`` (or none) is
+    ignored, so its places are geocoded again and the file is rewritten.
     """
+    global _geocode_disk_cache
+    if _geocode_disk_cache is None:
+        _geocode_disk_cache = {}
+        if GEOCODE_CACHE_FILE and os.path.exists(GEOCODE_CACHE_FILE):
+            try:
+                with open(GEOCODE_CACHE_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if (isinstance(data, dict) and data.get("version") == GEOCODE_CACHE_VERSION
+                        and isinstance(data.get("places"), dict)):
+                    _geocode_disk_cache = data["places"]
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: Ignoring unreadable geocode cache {GEOCODE_CACHE_FILE}: {e}", file=sys.stderr)
+    return _geocode_disk_cache
+
+
+def _save_geocode_cache(cache: dict):
+    """Write the geocode cache back to disk atomically."""
+    if not GEOCODE_CACHE_FILE:
+        return
+    try:
+        os.makedirs(os.path.dirname(GEOCODE_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{GEOCODE_CACHE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": GEOCODE_CACHE_VERSION, "places": cache}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, GEOCODE_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Could not write geocode cache {GEOCODE_CACHE_FILE}: {e}", file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_location_tags(place_name: str) -> dict:
+    """Geocode ``place_name`` once per process (and once per cache file).
+
+    Nominatim is rate-limited to one request per second, so a batch of photos
+    from the same place should not look it up again for every run or file.
+    Callers must copy the returned dict before modifying it.
+    """
+    cache = _load_geocode_cache()
+    if place_name in cache:
+        return cache[place_name]
+
+    tags = _geocode_location_tags(place_name)
+    cache[place_name] = tags
+    _save_geocode_cache(cache)
+    return tags
+
+
+def _geocode_location_tags(place_name: str) -> dict:
+    """Look up GPS and address tags for a place name (no date/offset tags)."""
     # Use shared location utilities
     try:
         from location_utils import get_location_metadata
-        return get_location_metadata(place_name, date_str, offset_str)
+        return get_location_metadata(place_name)
     except ImportError:
         # Fallback to inline implementation if location_utils not available
         import requests
@@ -340,14 +831,7 @@ def create_exif_metadata(place_name: str, date_str: str = "", offset_str: str =
             except Exception:
                 pass
         
-        metadata = {}
-        if date_str:
-            metadata["DateTimeOriginal"] = date_str
-            metadata["CreateDate"] = date_str
-        if offset_str:
-            metadata["OffsetTimeOriginal"] = offset_str
-            metadata["OffsetTimeDigitized"] = offset_str
-        metadata.update({
+        return {
             "GPSLatitude": abs(location.latitude),
             "GPSLatitudeRef": "N" if location.latitude >= 0 else "S",
             "GPSLongitude": abs(location.longitude),
@@ -361,27 +845,83 @@ def create_exif_metadata(place_name: str, date_str: str = "", offset_str: str =
             "XMP-iptcExt:LocationShownCountryName": country,
             "XMP-iptcExt:LocationShownCountryCode": country_code,
             "XMP-dc:Coverage": place_name,
-        })
-        return metadata
+        }
+
+
+def create_exif_metadata(place_name: str, date_str: str = "", offset_str: str = "") -> dict:
+    """Generate EXIF/XMP metadata for a location and optional timestamp.
+
+    Parameters:
+    - ``place_name``: Human‑readable location (required for location tags).
+    - ``date_str``:   Date/time in ``YYYY:MM:DD HH:MM:SS`` format (optional).
+    - ``offset_str``: UTC offset string like ``+05:30`` (optional).
+
+    Geocoding results are cached per place name, in memory and in
+    ``GEOCODE_CACHE_FILE``.
+    """
+    metadata = {}
+    if date_str:
+        metadata["DateTimeOriginal"] = date_str
+        metadata["CreateDate"] = date_str
+    if offset_str:
+        metadata["OffsetTimeOriginal"] = offset_str
+        metadata["OffsetTimeDigitized"] = offset_str
+    metadata.update(_cached_location_tags(place_name))
+    return metadata
 
 
 def _normalize_keywords(keywords) -> list:
     """Ensure keywords are a list of unique strings, handling various input types."""
     if isinstance(keywords, str):
         # Split by comma, strip whitespace, filter empty strings
-        return sorted(list(set([k.strip() for k in keywords.split(',') if k.strip()])))
-    elif isinstance(keywords, (list, tuple, set)):
-        return sorted(list(set([str(k).strip() for k in keywords if str(k).strip()])))
+        return sorted({k for k in (part.strip() for part in keywords.split(',')) if k})
+    elif isinstance(keywords, (list, tuple, set, frozenset)):
+        return sorted({k for k in (str(item).strip() for item in keywords) if k})
     return []
 
 
-def verify_exif_written(file_path: str, expected_tags: dict, verbose: int = 0) -> bool:
+def merge_keywords(existing, to_add, to_remove) -> list:
+    """Apply keyword additions and removals to a file's existing keywords.
+
+    Removals win over additions. Returns the sorted, de-duplicated result.
+    """
+    return sorted(set(existing).union(to_add).difference(to_remove))
+
+
+def get_tag_value(file_path: str, tag: str, session: ExifToolSession = None,
+                  timeout: float = 5, verbose: int = 0) -> str:
+    """Read one tag's printed value, or "" if the file does not have it.
+    
+    ``-s3`` makes exiftool print the bare value, so there is no JSON to parse.
+    List values come back comma-separated. Raises ``subprocess.TimeoutExpired``
+    if exiftool takes longer than ``timeout`` seconds (a session restarts its
+    exiftool first).
+    """
+    # No -fast2: the tag may be a maker note, or live after a video's mdat
+    cmd = ['exiftool', '-s3', '-' + tag, file_path]
+    if verbose >= 3:
+        print(f"[DEBUG] Tag read command: {' '.join(cmd)}")
+    
+    if session is not None:
+        stdout, stderr = session.execute(cmd[1:], timeout=timeout)
+    else:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        stdout, stderr = result.stdout, result.stderr
+    
+    if verbose >= 3:
+        print(f"[DEBUG] Tag read stderr: '{stderr.strip()}'")
+    return stdout.strip()
+
+
+def verify_exif_written(file_path: str, expected_tags: dict, verbose: int = 0,
+                        session: ExifToolSession = None) -> bool:
     """Verify that EXIF tags were actually written to the file.
     
     Args:
         file_path: Path to the file to check
         expected_tags: Dictionary of tags that should have been written
         verbose: Verbosity level
+        session: Optional persistent exiftool session to read through
     
     Returns:
         True if at least one tag is verified, False otherwise
@@ -409,18 +949,13 @@ def verify_exif_written(file_path: str, expected_tags: dict, verbose: int = 0) -
             print(f"[DEBUG] Will verify tag: {verify_tags[0]}")
         
         # Use exiftool to read back one tag
-        cmd = ['exiftool', '-' + verify_tags[0], '-s3', file_path]
-        if verbose >= 3:
-            print(f"[DEBUG] Verification command: {' '.join(cmd)}")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        value = get_tag_value(file_path, verify_tags[0], session=session, verbose=verbose)
         
         if verbose >= 3:
-            print(f"[DEBUG] Verification result stdout: '{result.stdout.strip()}'")
-            print(f"[DEBUG] Verification result stderr: '{result.stderr.strip()}'")
+            print(f"[DEBUG] Verification read back: '{value}'")
         
         # If we got any output, the tag was written
-        success = bool(result.stdout.strip())
+        success = bool(value)
         
         if verbose >= 2:
             print(f"[DEBUG] Verification {'succeeded' if success else 'FAILED'}")
@@ -614,6 +1149,7 @@ def reprocess_file_in_database(db_path: str, file_path: str, verbose: int = 0) -
 
 
 def main():
+    global GEOCODE_CACHE_FILE
     parser = argparse.ArgumentParser(description="Apply EXIF/XMP tags to images.")
     parser.add_argument("--dry-run", action="store_true", help="Print exiftool commands without writing.")
     parser.add_argument("--tags-yaml", type=str, help="Path to a YAML file containing tag name/value pairs.")
@@ -623,6 +1159,8 @@ def main():
     
     # Location metadata - either lookup by place OR specify manually
     parser.add_argument("--place", type=str, help="Place name for location metadata (e.g., 'Fort Worth, Texas, USA'). If specified, will geocode this location.")
+    parser.add_argument("--geocode-cache", type=str, metavar="PATH", help=f"File caching geocoded places between runs (default: {GEOCODE_CACHE_FILE}).")
+    parser.add_argument("--no-geocode-cache", action="store_true", help="Do not read or write the geocode cache file.")
     
     # Manual location controls (used if --place is NOT specified)
     parser.add_argument("--latitude", type=float, help="GPS latitude (-90 to 90, North is positive).")
@@ -655,6 +1193,13 @@ def main():
     
     args = parser.parse_args()
 
+    # Point the geocode cache at the requested file (or disable it)
+    # before anything is looked up.
+    if args.no_geocode_cache:
+        GEOCODE_CACHE_FILE = None
+    elif args.geocode_cache:
+        GEOCODE_CACHE_FILE = os.path.expanduser(args.geocode_cache)
+
     # Load tags from YAML if provided.
     yaml_tags = {}
     if args.tags_yaml:
@@ -735,8 +1280,8 @@ def main():
     # Determine if keyword modification is requested.
     # If so, we need to read existing keywords per file.
     modify_keywords_per_file = bool(args.add_keyword or args.remove_keyword)
-    keywords_to_add_set = set(args.add_keyword)
-    keywords_to_remove_set = set(args.remove_keyword)
+    keywords_to_add_set = frozenset(args.add_keyword)
+    keywords_to_remove_set = frozenset(args.remove_keyword)
 
     if target_files:
         # Apply limit if specified
@@ -755,99 +1300,128 @@ def main():
             print(f"[DEBUG] Base tags to apply: {base_tags}")
             print(f"[DEBUG] Files to process: {target_files}")
         
-        for file_path in target_files:
-            print(f"\nProcessing file: {file_path}")
+        # One persistent exiftool process serves every read/write in the loop,
+        # instead of a fresh Perl start-up per call.
+        session = None
+        if not args.dry_run or modify_keywords_per_file:
+            try:
+                session = ExifToolSession()
+            except RuntimeError:
+                session = None  # Fall back to per-call subprocesses
+
+        try:
+            # Read every file's current keywords up front in one exiftool call
+            existing_keywords_by_file = {}
+            if modify_keywords_per_file:
+                existing_keywords_by_file = get_existing_keywords_batch(target_files, session=session)
+
+            for file_path in target_files:
+                print(f"\nProcessing file: {file_path}")
             
-            if args.verbose >= 2:
-                print(f"[DEBUG] ========== Processing: {file_path} ==========")
-                print(f"[DEBUG] File exists: {os.path.exists(file_path)}")
-                if os.path.exists(file_path):
-                    import stat
-                    st = os.stat(file_path)
-                    print(f"[DEBUG] File size: {st.st_size} bytes")
-                    print(f"[DEBUG] File permissions: {oct(st.st_mode)}")
+                if args.verbose >= 2:
+                    print(f"[DEBUG] ========== Processing: {file_path} ==========")
+                    print(f"[DEBUG] File exists: {os.path.exists(file_path)}")
+                    if os.path.exists(file_path):
+                        import stat
+                        st = os.stat(file_path)
+                        print(f"[DEBUG] File size: {st.st_size} bytes")
+                        print(f"[DEBUG] File permissions: {oct(st.st_mode)}")
             
-            current_file_tags = base_tags.copy() # Start with base tags for this file
+                current_file_tags = base_tags.copy() # Start with base tags for this file
 
-            # Handle keywords if modification is requested.
-            if modify_keywords_per_file:
-                existing_keywords = get_existing_keywords(file_path)
+                # Handle keywords if modification is requested.
+                if modify_keywords_per_file:
+                    existing_keywords = existing_keywords_by_file.get(file_path)
+                    if existing_keywords is None:
+                        existing_keywords = get_existing_keywords(file_path, session=session)
                 
-                # Process XMP-dc:Subject
-                current_subjects = set(existing_keywords.get("XMP-dc:Subject", []))
-                updated_subjects = (current_subjects.union(keywords_to_add_set)).difference(keywords_to_remove_set)
-                # Only add to tags if there are actual subjects or if we're explicitly clearing them.
-                if updated_subjects:
-                    current_file_tags["XMP-dc:Subject"] = sorted(list(updated_subjects))
-                elif keywords_to_add_set or keywords_to_remove_set: # If modification was attempted and resulted in empty, set to empty
-                    current_file_tags["XMP-dc:Subject"] = ""
+                    # Process XMP-dc:Subject
+                    updated_subjects = merge_keywords(existing_keywords.get("XMP-dc:Subject", []),
+                                                      keywords_to_add_set, keywords_to_remove_set)
+                    # Only add to tags if there are actual subjects or if we're explicitly clearing them.
+                    if updated_subjects:
+                        current_file_tags["XMP-dc:Subject"] = updated_subjects
+                    elif keywords_to_add_set or keywords_to_remove_set: # If modification was attempted and resulted in empty, set to empty
+                        current_file_tags["XMP-dc:Subject"] = ""
                 
-                # Process IPTC:Keywords
-                current_iptc_keywords = set(existing_keywords.get("IPTC:Keywords", []))
-                updated_iptc_keywords = (current_iptc_keywords.union(keywords_to_add_set)).difference(keywords_to_remove_set)
-                # Only add to tags if there are actual keywords or if we're explicitly clearing them.
-                if updated_iptc_keywords:
-                    current_file_tags["IPTC:Keywords"] = sorted(list(updated_iptc_keywords))
-                elif keywords_to_add_set or keywords_to_remove_set: # If modification was attempted and resulted in empty, set to empty
-                    current_file_tags["IPTC:Keywords"] = ""
-
-            if args.verbose >= 2:
-                print(f"[DEBUG] Tags to apply for {file_path}:")
+                    # Process IPTC:Keywords
+                    updated_iptc_keywords = merge_keywords(existing_keywords.get("IPTC:Keywords", []),
+                                                           keywords_to_add_set, keywords_to_remove_set)
+                    # Only add to tags if there are actual keywords or if we're explicitly clearing them.
+                    if updated_iptc_keywords:
+                        current_file_tags["IPTC:Keywords"] = updated_iptc_keywords
+                    elif keywords_to_add_set or keywords_to_remove_set: # If modification was attempted and resulted in empty, set to empty
+                        current_file_tags["IPTC:Keywords"] = ""
+
+                if args.verbose >= 2:
+                    print(f"[DEBUG] Tags to apply for {file_path}:")
             
-            for tag_name, tag_value in current_file_tags.items():
-                print(f"Tag: {tag_name} = '{tag_value}'")
+                for tag_name, tag_value in current_file_tags.items():
+                    print(f"Tag: {tag_name} = '{tag_value}'")
             
-            # Apply EXIF tags
-            if args.verbose >= 2:
-                print(f"[DEBUG] Step 1: Writing EXIF tags to file...")
+                # Apply EXIF tags
+                if args.verbose >= 2:
+                    print(f"[DEBUG] Step 1: Writing EXIF tags to file...")
             
-            try:
-                run_exiftool([file_path], current_file_tags, args.dry_run, verbose=args.verbose)
+                try:
+                    run_exiftool([file_path], current_file_tags, args.dry_run, verbose=args.verbose,
+                                 session=session)
                 
-                if not args.dry_run:
-                    if args.verbose >= 2:
-                        print(f"[DEBUG] Step 2: Verifying EXIF write...")
+                    if not args.dry_run:
+                        if args.verbose >= 2:
+                            print(f"[DEBUG] Step 2: Verifying EXIF write...")
                     
-                    # Verify EXIF was actually written
-                    if verify_exif_written(file_path, current_file_tags, verbose=args.verbose):
-                        print(f"  ✓ EXIF tags written successfully")
-                    else:
-                        print(f"  ⚠ EXIF tags may not have been written", file=sys.stderr)
+                        # Verify EXIF was actually written
+                        if verify_exif_written(file_path, current_file_tags, verbose=args.verbose,
+                                               session=session):
+                            print(f"  ✓ EXIF tags written successfully")
+                        else:
+                            print(f"  ⚠ EXIF tags may not have been written", file=sys.stderr)
                 
-            except Exception as e:
-                print(f"  ✗ Failed to write EXIF tags: {e}", file=sys.stderr)
-                if args.verbose >= 2:
-                    import traceback
-                    print(f"[DEBUG] Exception details:")
-                    traceback.print_exc()
-                continue  # Skip reprocessing if EXIF write failed
+                except Exception as e:
+                    print(f"  ✗ Failed to write EXIF tags: {e}", file=sys.stderr)
+                    if args.verbose >= 2:
+                        import traceback
+                        print(f"[DEBUG] Exception details:")
+                        traceback.print_exc()
+                    if isinstance(e, ExifToolSessionError):
+                        # Even a restarted exiftool died; run one per call
+                        # for the remaining files
+                        print("  Warning: exiftool session failed, continuing without it", file=sys.stderr)
+                        session.close()
+                        session = None
+                    continue  # Skip reprocessing if EXIF write failed
             
-            # Check if file is in database and reprocess if requested
-            if args.db_path and args.reprocess_db and not args.dry_run:
-                if args.verbose >= 2:
-                    print(f"[DEBUG] Step 3: Checking if file is in database...")
-                
-                # Small delay to ensure filesystem sync (especially on network drives)
-                import time
-                if args.verbose >= 2:
-                    print(f"[DEBUG] Waiting 200ms for filesystem sync...")
-                time.sleep(0.2)  # Increased to 200ms for better reliability
+                # Check if file is in database and reprocess if requested
+                if args.db_path and args.reprocess_db and not args.dry_run:
+                    if args.verbose >= 2:
+                        print(f"[DEBUG] Step 3: Checking if file is in database...")
                 
-                if check_file_in_database(args.db_path, file_path):
-                    if args.verbose >= 1:
-                        print(f"  File found in database, reprocessing...")
+                    # Small delay to ensure filesystem sync (especially on network drives)
+                    import time
                     if args.verbose >= 2:
-                        print(f"[DEBUG] Step 4: Reprocessing file in database...")
+                        print(f"[DEBUG] Waiting 200ms for filesystem sync...")
+                    time.sleep(0.2)  # Increased to 200ms for better reliability
+                
+                    if check_file_in_database(args.db_path, file_path):
+                        if args.verbose >= 1:
+                            print(f"  File found in database, reprocessing...")
+                        if args.verbose >= 2:
+                            print(f"[DEBUG] Step 4: Reprocessing file in database...")
                     
-                    success = reprocess_file_in_database(args.db_path, file_path, verbose=args.verbose)
-                    if not success:
-                        print(f"  Warning: Reprocessing failed, database may be out of sync", file=sys.stderr)
-                else:
-                    if args.verbose >= 1:
-                        print(f"  (File not in database, skipping reprocess)")
-                    if args.verbose >= 2:
-                        print(f"[DEBUG] File {file_path} not found in database")
+                        success = reprocess_file_in_database(args.db_path, file_path, verbose=args.verbose)
+                        if not success:
+                            print(f"  Warning: Reprocessing failed, database may be out of sync", file=sys.stderr)
+                    else:
+                        if args.verbose >= 1:
+                            print(f"  (File not in database, skipping reprocess)")
+                        if args.verbose >= 2:
+                            print(f"[DEBUG] File {file_path} not found in database")
         
+        finally:
+            if session is not None:
+                session.close()
+
         # Summary
         if args.db_path and args.reprocess_db and not args.dry_run:
             print(f"\n✓ EXIF tags applied and database updated for {len(target_files)} file(s).")
@@ -861,23 +1435,35 @@ def main():
     if modify_keywords_per_file:
         print("Warning: --add-keyword and --remove-keyword are ignored in legacy PATTERN_TAG_MAP mode.", file=sys.stderr)
 
-    seen = set()
-    for pattern, tag_value in PATTERN_TAG_MAP.items():
-        files = sorted(set(glob.glob(pattern)) - seen)
-        seen.update(files)
-        if not files:
-            print(f"[WARN] No matches for {pattern}")
-            continue
-        # Use the default tag name for legacy entries.
-        legacy_tags = {DEFAULT_TAG_NAME: tag_value}
-        # Merge any additional tags supplied via YAML/CLI (base_tags).
-        if base_tags:
-            legacy_tags.update(base_tags)
-        print(f"\nPattern: {pattern}")
-        for tn, tv in legacy_tags.items():
-            print(f"Tag: {tn} = '{tv}'")
-        print(f"Files: {len(files)}")
-        run_exiftool(files, legacy_tags, args.dry_run)
+    # Each pattern is one exiftool command; share a process across them
+    session = None
+    if PATTERN_TAG_MAP and not args.dry_run:
+        try:
+            session = ExifToolSession()
+        except RuntimeError:
+            session = None  # Fall back to per-call subprocesses
+
+    try:
+        seen = set()
+        for pattern, tag_value in PATTERN_TAG_MAP.items():
+            files = sorted(set(glob.glob(pattern)) - seen)
+            seen.update(files)
+            if not files:
+                print(f"[WARN] No matches for {pattern}")
+                continue
+            # Use the default tag name for legacy entries.
+            legacy_tags = {DEFAULT_TAG_NAME: tag_value}
+            # Merge any additional tags supplied via YAML/CLI (base_tags).
+            if base_tags:
+                legacy_tags.update(base_tags)
+            print(f"\nPattern: {pattern}")
+            for tn, tv in legacy_tags.items():
+                print(f"Tag: {tn} = '{tv}'")
+            print(f"Files: {len(files)}")
+            run_exiftool(files, legacy_tags, args.dry_run, session=session)
+    finally:
+        if session is not None:
+            session.close()
     print("\nDone.")
 
 
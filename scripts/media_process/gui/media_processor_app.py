@@ -53,6 +53,13 @@ try:
 except ImportError:
     RAW_AVAILABLE = False
 
+# Persistent exiftool process for EXIF panel reads
+try:
+    from apply_exif import ExifToolSession
+    EXIFTOOL_SESSION_AVAILABLE = True
+except ImportError:
+    EXIFTOOL_SESSION_AVAILABLE = False
+
 # Supported RAW formats
 RAW_EXTENSIONS = {
     '.cr2', '.cr3',  # Canon
@@ -239,6 +246,7 @@ class MediaProcessorApp:
         self.all_files: List[str] = []
         self.current_preview_image = None
         self._updating_filter = False  # Flag to prevent recursive updates
+        self._exif_session = None  # Started on first EXIF read
         
         # Setup UI
         self.setup_ui()
@@ -948,8 +956,7 @@ class MediaProcessorApp:
                        'DateTimeOriginal', 'CreateDate', 'ModifyDate',
                        'ISO', 'FNumber', 'ExposureTime', 'FocalLength',
                        'LensModel', 'Orientation']
-                for tag in tags:
-                    cmd.append(f'-{tag}')
+                cmd.extend([f'-{tag}' for tag in tags])
                     
             elif filter_mode == "GPS/Location":
                 # GPS and location tags
@@ -963,8 +970,7 @@ class MediaProcessorApp:
                        'ISO', 'FNumber', 'ExposureTime', 'FocalLength',
                        'FocalLengthIn35mmFormat', 'WhiteBalance', 'Flash',
                        'ExposureProgram', 'MeteringMode', 'ExposureCompensation']
-                for tag in tags:
-                    cmd.append(f'-{tag}')
+                cmd.extend([f'-{tag}' for tag in tags])
                     
             elif filter_mode == "Keywords":
                 # Keywords and captions
@@ -977,23 +983,34 @@ class MediaProcessorApp:
                 tags = ['ImageWidth', 'ImageHeight', 'Duration', 'VideoFrameRate',
                        'VideoCodec', 'AudioChannels', 'AudioBitrate', 'AudioCodec',
                        'CompressorName', 'BitDepth', 'ColorSpace']
-                for tag in tags:
-                    cmd.append(f'-{tag}')
+                cmd.extend([f'-{tag}' for tag in tags])
             else:
                 # All tags (default)
                 cmd.append('-a')
             
             cmd.append(file_path)
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            session = self._get_exif_session()
+            if session is not None:
+                try:
+                    # Same limit as the one-shot path; on timeout the session
+                    # replaces its stuck exiftool before raising
+                    stdout, _ = session.execute(cmd[1:], timeout=5)
+                except RuntimeError:
+                    # exiftool died; start a new one on the next read
+                    self.close_exif_session()
+                    raise
+            else:
+                # Bytes go straight to json.loads; no text decode needed
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    timeout=5
+                )
+                stdout = result.stdout if result.returncode == 0 else b''
             
-            if result.returncode == 0 and result.stdout:
-                data = json.loads(result.stdout)
+            if stdout:
+                data = json.loads(stdout)
                 if data and isinstance(data, list) and len(data) > 0:
                     exif_data = data[0]
                     
@@ -1013,6 +1030,29 @@ class MediaProcessorApp:
             
         return None
     
+    def _get_exif_session(self):
+        """Return the shared exiftool session, starting it if needed.
+        
+        Clicking through files reads EXIF for every selection, so one
+        long-lived exiftool avoids a Perl start-up per click. Returns None if
+        a session can't be started; callers then run exiftool directly.
+        """
+        if self._exif_session is None and EXIFTOOL_SESSION_AVAILABLE:
+            try:
+                self._exif_session = ExifToolSession()
+            except RuntimeError:
+                return None
+        return self._exif_session
+    
+    def close_exif_session(self):
+        """Shut down the shared exiftool session, if one is running."""
+        if self._exif_session is not None:
+            session, self._exif_session = self._exif_session, None
+            try:
+                session.close()
+            except Exception:
+                pass
+    
     def on_exif_filter_change(self):
         """Handle EXIF filter change - refresh info if file is selected."""
         # Guard against early initialization calls
@@ -2067,7 +2107,10 @@ def main():
     """Main entry point."""
     root = tk.Tk()
     app = MediaProcessorApp(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.close_exif_session()
 
 
 if __name__ == "__main__":
@@ -5,13 +5,31 @@ This module provides functions for geocoding place names and extracting
 location metadata for use in EXIF tags and other applications.
 """
 
+import functools
+import math
+import re
 import requests
 import time
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 from typing import Dict, Optional, Tuple
 
+# Optional: vectorized coordinate validation
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
+
+# A whole "lat, lon[, alt]" string: two or three plain signed decimals,
+# separated by a comma and/or whitespace
+_DECIMAL = r"([-+]?(?:\d+(?:\.\d*)?|\.\d+))"
+_COORD_SEP = r"(?:\s*,\s*|\s+)"
+_COORD_RE = re.compile(rf"\s*{_DECIMAL}{_COORD_SEP}{_DECIMAL}(?:{_COORD_SEP}{_DECIMAL})?\s*")
+
+
+@functools.lru_cache(maxsize=4096)
 def geocode_place(place_name: str, user_agent: str = "ExifLocationTool/1.0 (contact: deven@example.com)", max_retries: int = 5, timeout: int = 30) -> Optional[object]:
     """Geocode a place name to get location information.
     
@@ -26,6 +44,9 @@ def geocode_place(place_name: str, user_agent: str = "ExifLocationTool/1.0 (cont
     
     Raises:
         ValueError: If place cannot be geocoded
+    
+    Successful lookups are memoized per process, so repeated place names make
+    one Nominatim request; failures are not cached.
     """
     geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
     location = None
@@ -313,3 +334,74 @@ def format_coordinates(latitude: float, longitude: float) -> Tuple[str, str]:
     lon_str = f"{abs(longitude):.6f}° {lon_dir}"
     
     return lat_str, lon_str
+
+
+def validate_coordinates(latitude: Optional[float], longitude: Optional[float]) -> bool:
+    """Check that a latitude/longitude pair is a real position.
+    
+    Args:
+        latitude: Latitude coordinate (-90 to 90)
+        longitude: Longitude coordinate (-180 to 180)
+    
+    Returns:
+        True if both are present, finite and in range
+    """
+    # isfinite rejects NaN, which every range comparison would let through
+    return (latitude is not None and longitude is not None
+            and math.isfinite(latitude) and math.isfinite(longitude)
+            and -90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0)
+
+
+def validate_coordinates_batch(latitudes, longitudes):
+    """Validate many latitude/longitude pairs at once.
+    
+    Args:
+        latitudes: Sequence of latitudes; None marks a missing value
+        longitudes: Sequence of longitudes, same length as ``latitudes``
+    
+    Returns:
+        Boolean NumPy array with one entry per pair, or a list of bools when
+        NumPy is not installed
+    """
+    if not NUMPY_AVAILABLE:
+        return [validate_coordinates(lat, lon) for lat, lon in zip(latitudes, longitudes)]
+    
+    # None becomes NaN, which isfinite rejects
+    lats = np.asarray(latitudes, dtype=np.float64)
+    lons = np.asarray(longitudes, dtype=np.float64)
+    return np.isfinite(lats) & np.isfinite(lons) & (np.abs(lats) <= 90.0) & (np.abs(lons) <= 180.0)
+
+
+def parse_coordinates(text: str) -> Tuple[float, ...]:
+    """Parse a "latitude, longitude[, altitude]" string.
+    
+    Args:
+        text: Coordinates in decimal degrees, e.g. "40.7128, -74.0060, 10"
+    
+    Returns:
+        Tuple of (latitude, longitude) or (latitude, longitude, altitude)
+    
+    Raises:
+        ValueError: If the text is anything but two or three plain decimals,
+            e.g. hemisphere letters, degrees/minutes/seconds or exponents
+    """
+    match = _COORD_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Expected 'latitude, longitude[, altitude]', got: {text!r}")
+    return tuple(float(number) for number in match.groups() if number is not None)
+
+
+def format_address(city: str = "", state: str = "", country: str = "", country_code: str = "") -> str:
+    """Join the non-empty address components for display.
+    
+    Args:
+        city: City name
+        state: State/province name
+        country: Country name
+        country_code: Country code (e.g., "US"); shown only without a country
+    
+    Returns:
+        Comma-separated address, or "" if every component is empty
+    """
+    parts = [city, state, country or (country_code or "").upper()]
+    return ", ".join(part for part in parts if part)
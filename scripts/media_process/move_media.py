@@ -7,6 +7,7 @@ existing files.
 """
 
 import argparse
+import errno
 import json
 import os
 import shutil
@@ -14,13 +15,14 @@ import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 # Import shared utilities
 try:
     from media_utils import (
         create_database_schema,
         calculate_file_hash,
+        calculate_file_hashes,
         get_mime_type,
         is_image_file,
         is_video_file
@@ -34,6 +36,7 @@ except ImportError:
 try:
     from audit_utils import (
         get_audit_logger,
+        flush_audit_log,
         log_session_start,
         log_session_end,
         log_file_moved,
@@ -64,6 +67,13 @@ except Exception as e:
     sys.exit(1)
 
 
+# Files per database transaction; bounds the WAL while keeping commits rare
+COMMIT_BATCH_SIZE = 500
+
+# Values per IN (...) lookup; stays under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
 def move_file(source_path: str, dest_dir: str, dry_run: bool, verbose: int) -> Tuple[bool, str]:
     """Move a file to destination directory.
     
@@ -102,8 +112,14 @@ def move_file(source_path: str, dest_dir: str, dry_run: bool, verbose: int) -> T
             # Create destination directory if needed
             os.makedirs(dest_dir, exist_ok=True)
             
-            # Move the file
-            shutil.move(source_path, dest_path)
+            # Move the file: a plain rename on the same filesystem, skipping
+            # shutil.move's extra stat checks; copy + delete across devices
+            try:
+                os.rename(source_path, dest_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(source_path, dest_path)
             
             if verbose >= 2:
                 print(f"  ✓ Moved to: {dest_path}")
@@ -116,7 +132,8 @@ def move_file(source_path: str, dest_dir: str, dry_run: bool, verbose: int) -> T
 
 
 def update_or_insert_file(conn: sqlite3.Connection, old_path: str, new_path: str,
-                          volume: str, verbose: int, dry_run: bool) -> Tuple[str, int]:
+                          volume: str, verbose: int, dry_run: bool,
+                          file_hash: str = None) -> Tuple[str, int]:
     """Update existing file record or insert new one.
     
     Checks if the file exists in database by old_path (source path):
@@ -133,6 +150,7 @@ def update_or_insert_file(conn: sqlite3.Connection, old_path: str, new_path: str
         volume: Volume tag
         verbose: Verbosity level
         dry_run: If True, don't commit changes
+        file_hash: Content hash if already known; moving does not change it
     
     Returns:
         Tuple of (action, file_id) where action is 'updated', 'inserted', or 'error'
@@ -179,7 +197,8 @@ def update_or_insert_file(conn: sqlite3.Connection, old_path: str, new_path: str
             stat = os.stat(new_path)
             mime_type = get_mime_type(new_path)
             extension = os.path.splitext(new_path)[1].lower()
-            file_hash = calculate_file_hash(new_path)
+            if file_hash is None:
+                file_hash = calculate_file_hash(new_path)
             
             # Get dates in ISO format
             modified_date = datetime.fromtimestamp(stat.st_mtime).isoformat()
@@ -340,24 +359,32 @@ def process_metadata(conn: sqlite3.Connection, file_id: int, filepath: str,
             print(f"  Warning: Could not process metadata: {e}", file=sys.stderr)
 
 
-def check_destination_file(dest_path: str, source_hash: str, verbose: int) -> Tuple[bool, str]:
+def check_destination_file(dest_path: str, source_hash: str, verbose: int,
+                           source_size: int = None) -> Tuple[bool, str]:
     """Check if file exists in destination and if hash matches.
     
     Args:
         dest_path: Destination file path
         source_hash: Hash of source file
         verbose: Verbosity level
+        source_size: Size of source file in bytes, if known. A destination of
+            a different size cannot have the same hash, so it is not hashed.
     
     Returns:
         Tuple of (should_skip, skip_reason)
     """
-    if not os.path.exists(dest_path):
+    try:
+        dest_size = os.path.getsize(dest_path)
+    except OSError:
         return False, ""
     
     # File exists in destination
-    dest_hash = calculate_file_hash(dest_path)
+    if source_size is not None and dest_size != source_size:
+        dest_hash = None
+    else:
+        dest_hash = calculate_file_hash(dest_path)
     
-    if dest_hash == source_hash:
+    if dest_hash is not None and dest_hash == source_hash:
         if verbose >= 1:
             print(f"  Skipping: File already exists in destination with same hash")
         return True, "destination_exists_same_hash"
@@ -367,8 +394,53 @@ def check_destination_file(dest_path: str, source_hash: str, verbose: int) -> Tu
         return True, "destination_exists_different_hash"
 
 
+def fetch_database_records(conn: sqlite3.Connection, dest_paths: List[str],
+                           hashes: List[str], verbose: int) -> Tuple[Dict, Dict]:
+    """Look up a whole batch's destination paths and hashes up front.
+    
+    Runs one IN (...) query per LOOKUP_CHUNK_SIZE values instead of one query
+    per file, for check_database_record to consult during the move loop.
+    
+    Args:
+        conn: Database connection
+        dest_paths: Destination file paths
+        hashes: Source file hashes
+        verbose: Verbosity level (hashes are only looked up at 2+, the only
+            level that reports them)
+    
+    Returns:
+        Tuple of (path_records, hash_records)
+        path_records: {fullpath: (file_id, file_hash)}
+        hash_records: {file_hash: (count, example_path)}
+    """
+    cursor = conn.cursor()
+    path_records = {}
+    hash_records = {}
+    
+    dest_paths = list(dict.fromkeys(dest_paths))
+    for start in range(0, len(dest_paths), LOOKUP_CHUNK_SIZE):
+        chunk = dest_paths[start:start + LOOKUP_CHUNK_SIZE]
+        cursor.execute(
+            f"SELECT fullpath, id, file_hash FROM files "
+            f"WHERE fullpath IN ({','.join('?' * len(chunk))})", chunk)
+        for fullpath, file_id, file_hash in cursor.fetchall():
+            path_records[fullpath] = (file_id, file_hash)
+    
+    if verbose >= 2:
+        hashes = list(dict.fromkeys(h for h in hashes if h))
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            chunk = hashes[start:start + LOOKUP_CHUNK_SIZE]
+            cursor.execute(
+                f"SELECT file_hash, COUNT(*), MIN(fullpath) FROM files "
+                f"WHERE file_hash IN ({','.join('?' * len(chunk))}) GROUP BY file_hash", chunk)
+            for file_hash, count, example_path in cursor.fetchall():
+                hash_records[file_hash] = (count, example_path)
+    
+    return path_records, hash_records
+
+
 def check_database_record(conn: sqlite3.Connection, dest_path: str, source_hash: str,
-                         verbose: int) -> Tuple[bool, int, str]:
+                         verbose: int, db_records: Tuple[Dict, Dict] = None) -> Tuple[bool, int, str]:
     """Check if file exists in database at destination path.
     
     Args:
@@ -376,16 +448,19 @@ def check_database_record(conn: sqlite3.Connection, dest_path: str, source_hash:
         dest_path: Destination file path
         source_hash: Hash of source file
         verbose: Verbosity level
+        db_records: Prefetched (path_records, hash_records) from
+            fetch_database_records; queried per file if None
     
     Returns:
         Tuple of (exists, file_id, match_type)
         match_type: 'exact_match', 'path_match_different_hash', or ''
     """
-    cursor = conn.cursor()
+    if db_records is None:
+        db_records = fetch_database_records(conn, [dest_path], [source_hash], verbose)
+    path_records, hash_records = db_records
     
     # Check by destination path only
-    cursor.execute("SELECT id, file_hash FROM files WHERE fullpath = ?", (dest_path,))
-    result = cursor.fetchone()
+    result = path_records.get(dest_path)
     
     if result:
         file_id, db_hash = result
@@ -395,11 +470,10 @@ def check_database_record(conn: sqlite3.Connection, dest_path: str, source_hash:
             return True, file_id, 'path_match_different_hash'
     
     # Check if file with same hash exists elsewhere (informational only)
-    cursor.execute("SELECT COUNT(*), fullpath FROM files WHERE file_hash = ? LIMIT 1", (source_hash,))
-    result = cursor.fetchone()
+    result = hash_records.get(source_hash)
     
-    if result and result[0] > 0:
-        count, existing_path = result[0], result[1]
+    if result:
+        count, existing_path = result
         if verbose >= 2:
             print(f"  Note: {count} file(s) with same content exist in database")
             if existing_path:
@@ -409,7 +483,8 @@ def check_database_record(conn: sqlite3.Connection, dest_path: str, source_hash:
 
 
 def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Connection,
-                verbose: int, dry_run: bool, audit_log) -> Tuple[str, str]:
+                verbose: int, dry_run: bool, audit_log, source_hash: str = None,
+                db_records: Tuple[Dict, Dict] = None) -> Tuple[str, str]:
     """Process a single file: move and update database.
     
     Args:
@@ -419,6 +494,9 @@ def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Con
         conn: Database connection
         verbose: Verbosity level
         dry_run: If True, don't make changes
+        audit_log: Audit logger
+        source_hash: Precomputed hash of the source file, if available
+        db_records: Prefetched database records from fetch_database_records
     
     Returns:
         Tuple of (status, message)
@@ -435,7 +513,8 @@ def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Con
     
     # Get file info before moving
     old_path = os.path.abspath(source_path)
-    source_hash = calculate_file_hash(source_path)
+    if source_hash is None:
+        source_hash = calculate_file_hash(source_path)
     mime_type = get_mime_type(source_path)
     extension = os.path.splitext(source_path)[1].lower()
     
@@ -444,13 +523,15 @@ def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Con
     dest_path = os.path.join(dest_dir, filename)
     
     # Check if file already exists in destination
-    should_skip, skip_reason = check_destination_file(dest_path, source_hash, verbose)
+    should_skip, skip_reason = check_destination_file(dest_path, source_hash, verbose,
+                                                      source_size=os.path.getsize(source_path))
     if should_skip:
         log_skip(audit_log, source_path, skip_reason, f"dest={dest_path}, hash={source_hash}")
         return 'skipped', skip_reason
     
     # Check if file exists in database at destination path
-    db_exists, file_id, match_type = check_database_record(conn, dest_path, source_hash, verbose)
+    db_exists, file_id, match_type = check_database_record(conn, dest_path, source_hash, verbose,
+                                                            db_records)
     
     if db_exists:
         if match_type == 'exact_match':
@@ -474,7 +555,8 @@ def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Con
         return 'error', 'Failed to move file'
     
     # Update or insert database record
-    action, file_id = update_or_insert_file(conn, old_path, new_path, volume, verbose, dry_run)
+    action, file_id = update_or_insert_file(conn, old_path, new_path, volume, verbose, dry_run,
+                                            file_hash=source_hash)
     
     if action == 'error':
         log_error(audit_log, 'db_update_failed', f"Database update failed for: {new_path}")
@@ -484,9 +566,11 @@ def process_file(source_path: str, dest_dir: str, volume: str, conn: sqlite3.Con
     if not dry_run and file_id > 0:
         process_metadata(conn, file_id, new_path, mime_type, extension, verbose, dry_run)
     
-    # Log successful move
+    # Log successful move; the file is already at new_path, so the record
+    # goes to disk now rather than waiting for the batch commit
     if not dry_run:
         log_file_moved(audit_log, old_path, new_path, file_id, volume, source_hash, action)
+        flush_audit_log(audit_log)
     
     if verbose >= 1:
         action_str = "Would be " + action if dry_run else action.capitalize()
@@ -534,11 +618,19 @@ Examples:
                        help="Limit number of files to process (useful with --dry-run for testing)")
     parser.add_argument("--audit-log", type=str, default=None,
                        help="Path to audit log file (default: move_media_audit.log)")
+    parser.add_argument("--hash-workers", type=int, default=1,
+                       help="Files to hash in parallel before moving (default: 1; raise it "
+                            "for SSD sources, where parallel reads don't cost seeks)")
     
     args = parser.parse_args()
     
+    if args.hash_workers < 1:
+        parser.error("--hash-workers must be at least 1")
+    
     # Setup audit logging
-    audit_log = get_audit_logger('move_media', args.audit_log)
+    # Buffered: move records are flushed as they are written (process_file),
+    # skips and the rest alongside each database commit below
+    audit_log = get_audit_logger('move_media', args.audit_log, buffered=True)
     log_session_start(audit_log, 'move_media', vars(args))
     
     # Validate destination
@@ -621,7 +713,27 @@ Examples:
     skip_reasons = {}
     error_count = 0
     
-    for file_path in files_to_process:
+    # Hash the whole batch up front; each file is then hashed exactly once
+    source_hashes = calculate_file_hashes([f for f in files_to_process if os.path.exists(f)],
+                                          max_workers=args.hash_workers)
+    
+    # Take the write lock before the first file moves, so another writer cannot
+    # leave the database busy once files are already on disk at the destination
+    if not args.dry_run:
+        conn.execute("BEGIN IMMEDIATE")
+    
+    # Likewise fetch every destination's database record in a few batched
+    # queries, inside the transaction so no other writer can change them
+    # first. A record written later in this run is for a file now on disk at
+    # its destination, which check_destination_file catches first.
+    db_records = fetch_database_records(
+        conn,
+        [os.path.join(args.destination, os.path.basename(f)) for f in files_to_process],
+        list(source_hashes.values()),
+        args.verbose
+    )
+    
+    for index, file_path in enumerate(files_to_process, 1):
         status, action = process_file(
             file_path,
             args.destination,
@@ -629,7 +741,9 @@ Examples:
             conn,
             args.verbose,
             args.dry_run,
-            audit_log
+            audit_log,
+            source_hash=source_hashes.get(file_path),
+            db_records=db_records
         )
         
         if status == 'success':
@@ -643,10 +757,16 @@ Examples:
             skip_reasons[action] = skip_reasons.get(action, 0) + 1
         else:
             error_count += 1
+        
+        if not args.dry_run and index % COMMIT_BATCH_SIZE == 0:
+            conn.commit()
+            flush_audit_log(audit_log)
+            conn.execute("BEGIN IMMEDIATE")
     
     # Commit changes
     if not args.dry_run:
         conn.commit()
+        flush_audit_log(audit_log)
         if args.verbose >= 2:
             print("\n✓ Database changes committed")
     
@@ -668,6 +788,7 @@ Examples:
         'dry_run': args.dry_run
     }
     log_session_end(audit_log, 'move_media', stats)
+    flush_audit_log(audit_log)
     
     # Print summary
     if args.verbose >= 1:
@@ -5,37 +5,128 @@ This script uses exiftool to extract and display metadata in various formats.
 """
 
 import argparse
+import atexit
+import functools
 import json
 import os
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
+# Optional fast/binary encoders for machine-readable JSON output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def run_exiftool(files: List[str], options: List[str]) -> str:
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Persistent exiftool process for text-mode reads (installed alongside apply_exif)
+try:
+    from apply_exif import ExifToolSession
+    EXIFTOOL_SESSION_AVAILABLE = True
+except ImportError:
+    EXIFTOOL_SESSION_AVAILABLE = False
+
+_session = None
+
+# File-manager command used to reveal extracted thumbnails (None if unsupported)
+_OPEN_CMD = {'darwin': 'open', 'linux': 'xdg-open', 'win32': 'explorer'}.get(sys.platform)
+
+
+def run_exiftool(files: List[str], options: List[str], text: bool = True) -> Union[str, bytes]:
     """Run exiftool with specified options.
     
+    Output is memoized per (files, options, text) for as long as every file
+    keeps the same mtime and size, so repeated reads of an unchanged file
+    don't spawn exiftool again.
+    
     Args:
         files: List of file paths
         options: List of exiftool options
+        text: Decode output to str (False returns raw bytes)
     
     Returns:
         Output from exiftool
     """
+    try:
+        signature = tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, files))
+    except OSError:
+        # Let exiftool report missing/unreadable files; nothing to key on
+        return _run_exiftool(files, options, text)
+    return _run_exiftool_cached(tuple(files), tuple(options), text, signature)
+
+
+@functools.lru_cache(maxsize=128)
+def _run_exiftool_cached(files: tuple, options: tuple, text: bool, signature: tuple) -> Union[str, bytes]:
+    """run_exiftool's cache; ``signature`` holds each file's (mtime_ns, size)."""
+    return _run_exiftool(list(files), list(options), text)
+
+
+def _get_session() -> Optional['ExifToolSession']:
+    """Return the shared exiftool session, starting it on first use.
+    
+    Returns None when apply_exif's ExifToolSession is not importable or
+    exiftool cannot be started; callers then spawn exiftool per command.
+    """
+    global _session
+    if _session is None and EXIFTOOL_SESSION_AVAILABLE:
+        try:
+            _session = ExifToolSession()
+        except RuntimeError:
+            return None
+        atexit.register(_session.close)
+    return _session
+
+
+def _exiftool_text(args: List[str]) -> Tuple[str, str]:
+    """Run a text-mode exiftool command without checking its status.
+    
+    Goes through the shared session when available, saving a Perl start-up
+    per call in the per-file loops below.
+    
+    Returns:
+        Tuple of (stdout, stderr)
+    """
+    session = _get_session()
+    if session is not None:
+        return session.execute(args)
+    result = subprocess.run(['exiftool'] + args, capture_output=True, text=True, check=False)
+    return result.stdout, result.stderr
+
+
+def _run_exiftool(files: List[str], options: List[str], text: bool) -> Union[str, bytes]:
+    """Run exiftool once, without caching."""
     cmd = ['exiftool'] + options + files
     
+    # The session decodes output, so binary (-b) reads still spawn exiftool
+    session = _get_session() if text else None
+    if session is not None:
+        stdout, stderr = session.execute(options + files)
+        # No exit status in -stay_open mode; exiftool's failures print "Error:"
+        if any(line.startswith('Error') for line in stderr.splitlines()):
+            print(f"Error running exiftool: {stderr}", file=sys.stderr)
+            sys.exit(1)
+        return stdout
+    
     try:
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
+            text=text,
             check=True
         )
         return result.stdout
     except subprocess.CalledProcessError as e:
-        print(f"Error running exiftool: {e.stderr}", file=sys.stderr)
+        stderr = e.stderr if text else e.stderr.decode(errors='replace')
+        print(f"Error running exiftool: {stderr}", file=sys.stderr)
         sys.exit(1)
     except FileNotFoundError:
         print("Error: exiftool not found. Please install it:", file=sys.stderr)
@@ -60,9 +151,7 @@ def show_common_tags(files: List[str], grouped: bool = False, show_filenames: bo
         'LensModel', 'Orientation'
     ]
     
-    options = []
-    for tag in tags:
-        options.extend(['-' + tag])
+    options = [f'-{tag}' for tag in tags]
     
     if grouped:
         options.append('-G')
@@ -127,11 +216,7 @@ def show_specific_tags(files: List[str], tags: List[str], show_filenames: bool =
         tags: List of tag names
         show_filenames: Whether to show filenames
     """
-    options = []
-    for tag in tags:
-        if not tag.startswith('-'):
-            tag = '-' + tag
-        options.append(tag)
+    options = [tag if tag.startswith('-') else f'-{tag}' for tag in tags]
     
     if not show_filenames:
         options.append('-s3')
@@ -140,26 +225,62 @@ def show_specific_tags(files: List[str], tags: List[str], show_filenames: bool =
     print(output)
 
 
-def show_json(files: List[str], grouped: bool = False):
+def show_json(files: List[str], grouped: bool = False, output_format: str = 'pretty'):
     """Show EXIF data in JSON format.
     
     Args:
         files: List of file paths
         grouped: Whether to group tags by category
+        output_format: 'pretty' (indented JSON), 'minified' (single-line JSON)
+            or 'msgpack' (binary, written to stdout as raw bytes)
     """
-    options = ['-json', '-a']
+    # Fail before spending an exiftool run on output that can't be encoded
+    if output_format == 'msgpack' and not MSGPACK_AVAILABLE:
+        print("Error: msgpack output requires the msgpack package (pip install msgpack)",
+              file=sys.stderr)
+        sys.exit(1)
+    
+    if output_format == 'pretty':
+        options = ['-json', '-a']
+        
+        if grouped:
+            options.append('-G')
+        
+        output = run_exiftool(files, options)
+        
+        # Pretty print JSON
+        try:
+            data = json.loads(output)
+            print(json.dumps(data, indent=2))
+        except json.JSONDecodeError:
+            print(output)
+        return
+    
+    # Machine-consumer formats: keep structures intact and skip the text decode
+    options = ['-json', '-struct', '-a']
     
     if grouped:
         options.append('-G')
     
-    output = run_exiftool(files, options)
-    
-    # Pretty print JSON
+    output = run_exiftool(files, options, text=False)
     try:
-        data = json.loads(output)
-        print(json.dumps(data, indent=2))
-    except json.JSONDecodeError:
-        print(output)
+        data = orjson.loads(output) if ORJSON_AVAILABLE else json.loads(output)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+        # Don't hand a consumer something that isn't the requested format
+        print(f"Error: exiftool did not return valid JSON: {e}", file=sys.stderr)
+        print(output.decode('utf-8', errors='replace'), file=sys.stderr)
+        sys.exit(1)
+    
+    if output_format == 'msgpack':
+        payload = msgpack.packb(data, use_bin_type=True)
+    elif ORJSON_AVAILABLE:
+        payload = orjson.dumps(data) + b'\n'
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode() + b'\n'
+    
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.flush()
 
 
 def show_keywords(files: List[str], grouped: bool = False, show_filenames: bool = True):
@@ -232,12 +353,57 @@ def show_video_metadata(files: List[str], grouped: bool = False, show_filenames:
     print(output)
 
 
-def extract_thumbnails(files: List[str], output_dir: str = None):
+def write_thumbnail(output_file: str, *chunks: bytes):
+    """Write thumbnail bytes straight to a file descriptor.
+
+    Skips the buffered file object; multiple chunks go out in a single
+    writev() call. The one-shot output is dropped from the page cache
+    where the platform supports it.
+
+    Args:
+        output_file: Path to write
+        chunks: Thumbnail data, possibly split into fragments
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(output_file, flags, 0o644)
+    try:
+        if len(chunks) == 1:
+            os.write(fd, chunks[0])
+        else:
+            os.writev(fd, chunks)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def open_in_file_manager(path: str):
+    """Open a directory in the platform file manager without waiting for it.
+    
+    Args:
+        path: Directory to open
+    """
+    if _OPEN_CMD is None:
+        return
+    try:
+        subprocess.Popen(
+            [_OPEN_CMD, path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        print(f"Could not open {path} with {_OPEN_CMD}: {e}", file=sys.stderr)
+
+
+def extract_thumbnails(files: List[str], output_dir: str = None, open_when_done: bool = False):
     """Extract and save thumbnails from files.
     
     Args:
         files: List of file paths
         output_dir: Directory to save thumbnails (default: temp directory)
+        open_when_done: Open the output directory in the file manager afterwards
     """
     if output_dir is None:
         output_dir = tempfile.mkdtemp(prefix='exif_thumbnails_')
@@ -263,17 +429,15 @@ def extract_thumbnails(files: List[str], output_dir: str = None):
             
             if result.returncode == 0 and result.stdout and len(result.stdout) > 0:
                 # Save thumbnail
-                with open(output_file, 'wb') as f:
-                    f.write(result.stdout)
-                
+                write_thumbnail(output_file, result.stdout)
+
                 # Get thumbnail info
-                info_cmd = ['exiftool', '-s', '-ImageWidth', '-ImageHeight', output_file]
-                info_result = subprocess.run(info_cmd, capture_output=True, text=True, check=False)
+                info, _ = _exiftool_text(['-s', '-ImageWidth', '-ImageHeight', output_file])
                 
                 print(f"✓ {filename}")
                 print(f"  Saved to: {output_file}")
-                if info_result.stdout:
-                    print(f"  {info_result.stdout.strip()}")
+                if info:
+                    print(f"  {info.strip()}")
                 print()
                 
                 extracted_count += 1
@@ -291,16 +455,8 @@ def extract_thumbnails(files: List[str], output_dir: str = None):
         print(f"\nExtracted {extracted_count} thumbnail(s)")
         print(f"Location: {output_dir}")
         
-        # Try to open the directory in file manager
-        try:
-            if sys.platform == 'darwin':
-                subprocess.run(['open', output_dir], check=False)
-            elif sys.platform == 'linux':
-                subprocess.run(['xdg-open', output_dir], check=False)
-            elif sys.platform == 'win32':
-                subprocess.run(['explorer', output_dir], check=False)
-        except:
-            pass
+        if open_when_done:
+            open_in_file_manager(output_dir)
     else:
         print("\nNo thumbnails found in any files")
     
@@ -317,13 +473,11 @@ def show_thumbnail_info(files: List[str]):
         print(f"======== {file_path}")
         
         # Check for thumbnail
-        cmd = ['exiftool', '-a', '-G', '-ThumbnailImage', '-PreviewImage',
-               '-JpgFromRaw', '-OtherImage', file_path]
+        listing, _ = _exiftool_text(['-a', '-G', '-ThumbnailImage', '-PreviewImage',
+                                     '-JpgFromRaw', '-OtherImage', file_path])
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        
-        if result.stdout.strip():
-            print(result.stdout)
+        if listing.strip():
+            print(listing)
             
             # Try to get thumbnail dimensions
             thumb_cmd = ['exiftool', '-b', '-ThumbnailImage', file_path]
@@ -336,11 +490,10 @@ def show_thumbnail_info(files: List[str]):
                     tmp_path = tmp.name
                 
                 try:
-                    info_cmd = ['exiftool', '-s', '-ImageWidth', '-ImageHeight', '-FileSize', tmp_path]
-                    info_result = subprocess.run(info_cmd, capture_output=True, text=True, check=False)
-                    if info_result.stdout:
+                    info, _ = _exiftool_text(['-s', '-ImageWidth', '-ImageHeight', '-FileSize', tmp_path])
+                    if info:
                         print("Thumbnail Details:")
-                        print(info_result.stdout)
+                        print(info)
                 finally:
                     os.unlink(tmp_path)
         else:
@@ -370,6 +523,10 @@ Examples:
   # Output as JSON
   python3 show_exif.py --files photo.jpg video.mp4 --mode json
   
+  # Output single-line JSON / msgpack for another program to consume
+  python3 show_exif.py --files *.jpg --mode json --json-format minified
+  python3 show_exif.py --files *.jpg --mode json --json-format msgpack > meta.msgpack
+  
   # Show camera settings for multiple files
   python3 show_exif.py --files *.jpg --mode camera
   
@@ -384,6 +541,9 @@ Examples:
   
   # Extract thumbnails to specific directory
   python3 show_exif.py --files *.jpg --extract-thumbnails --thumbnail-dir ./thumbnails
+  
+  # Extract thumbnails and open the folder in the file manager
+  python3 show_exif.py --files *.jpg --extract-thumbnails --open-when-done
         """
     )
     
@@ -409,12 +569,20 @@ Examples:
     parser.add_argument("--compact", "-c", action="store_true",
                        help="Compact output format")
     
+    parser.add_argument("--json-format", default="pretty",
+                       choices=['pretty', 'minified', 'msgpack'],
+                       help="Output format for --mode json: pretty (default), minified "
+                            "single-line JSON, or binary msgpack")
+    
     parser.add_argument("--extract-thumbnails", action="store_true",
                        help="Extract and save thumbnails to files")
     
     parser.add_argument("--thumbnail-dir", type=str,
                        help="Directory to save extracted thumbnails (default: temp directory)")
     
+    parser.add_argument("--open-when-done", action="store_true",
+                       help="Open the thumbnail directory in the file manager after extraction")
+    
     parser.add_argument("--limit", type=int,
                        help="Limit number of files to process (useful for testing)")
     
@@ -473,7 +641,7 @@ Examples:
             show_specific_tags(files, args.tags, show_filenames)
         
         elif mode == 'json':
-            show_json(files, args.grouped)
+            show_json(files, args.grouped, args.json_format)
         
         elif mode == 'keywords':
             show_keywords(files, args.grouped, show_filenames)
@@ -490,7 +658,7 @@ Examples:
     # Extract thumbnails if requested
     if args.extract_thumbnails:
         print("\n" + "="*80 + "\n")
-        extract_thumbnails(files, args.thumbnail_dir)
+        extract_thumbnails(files, args.thumbnail_dir, args.open_when_done)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@
 #   ./run_all_tests.sh              # Run all tests
 #   ./run_all_tests.sh --coverage   # Run with coverage report
 #   ./run_all_tests.sh --verbose    # Run with verbose output
+#   ./run_all_tests.sh --parallel   # Run test files concurrently
 
 set -e
 
@@ -24,6 +25,7 @@ NC='\033[0m' # No Color
 # Parse arguments
 RUN_COVERAGE=false
 VERBOSE=""
+PARALLEL=false
 
 for arg in "$@"; do
     case $arg in
@@ -33,6 +35,9 @@ for arg in "$@"; do
         --verbose)
             VERBOSE="-v"
             ;;
+        --parallel)
+            PARALLEL=true
+            ;;
     esac
 done
 
@@ -67,36 +72,81 @@ export PYTHONPATH="$PROJECT_ROOT:$PYTHONPATH"
 FAILED_TESTS=()
 PASSED_TESTS=()
 
-for test_file in "${TEST_FILES[@]}"; do
-    if [ -f "$test_file" ]; then
+# Run one test file, printing its output; returns the unittest exit status
+run_test_file() {
+    local test_file="$1"
+    local coverage_args="$2"
+
+    # Extract module path from file path
+    local module_path
+    module_path=$(echo "$test_file" | sed 's|/|.|g' | sed 's|\.py$||')
+
+    if [ "$RUN_COVERAGE" = true ]; then
+        python3 -m coverage run --source=. $coverage_args -m unittest "$module_path" $VERBOSE
+    else
+        python3 -m unittest "$module_path" $VERBOSE
+    fi
+}
+
+record_result() {
+    local test_file="$1"
+    local status="$2"
+
+    if [ "$status" -eq 0 ]; then
+        echo -e "${GREEN}✓ PASSED${NC}"
+        PASSED_TESTS+=("$test_file")
+    else
+        echo -e "${RED}✗ FAILED${NC}"
+        FAILED_TESTS+=("$test_file")
+    fi
+    echo
+}
+
+if [ "$PARALLEL" = true ]; then
+    # Test files share no state (each uses its own temp dirs and exiftool
+    # session), so run them side by side and report in the usual order.
+    LOG_DIR=$(mktemp -d)
+    trap 'rm -rf "$LOG_DIR"' EXIT
+    PIDS=()
+
+    for i in "${!TEST_FILES[@]}"; do
+        test_file="${TEST_FILES[$i]}"
+        if [ -f "$test_file" ]; then
+            run_test_file "$test_file" "-p" > "$LOG_DIR/$i.log" 2>&1 &
+            PIDS[$i]=$!
+        fi
+    done
+
+    for i in "${!TEST_FILES[@]}"; do
+        test_file="${TEST_FILES[$i]}"
+        if [ -z "${PIDS[$i]}" ]; then
+            echo -e "${YELLOW}Skipping: $test_file (not found)${NC}"
+            echo
+            continue
+        fi
         echo -e "${BLUE}Running: $test_file${NC}"
-        
-        # Extract module path from file path
-        module_path=$(echo "$test_file" | sed 's|/|.|g' | sed 's|\.py$||')
-        
-        if [ "$RUN_COVERAGE" = true ]; then
-            if python3 -m coverage run --source=. -a -m unittest "$module_path" $VERBOSE; then
-                echo -e "${GREEN}✓ PASSED${NC}"
-                PASSED_TESTS+=("$test_file")
-            else
-                echo -e "${RED}✗ FAILED${NC}"
-                FAILED_TESTS+=("$test_file")
-            fi
+        status=0
+        wait "${PIDS[$i]}" || status=$?
+        cat "$LOG_DIR/$i.log"
+        record_result "$test_file" "$status"
+    done
+
+    if [ "$RUN_COVERAGE" = true ]; then
+        python3 -m coverage combine --append
+    fi
+else
+    for test_file in "${TEST_FILES[@]}"; do
+        if [ -f "$test_file" ]; then
+            echo -e "${BLUE}Running: $test_file${NC}"
+            status=0
+            run_test_file "$test_file" "-a" || status=$?
+            record_result "$test_file" "$status"
         else
-            if python3 -m unittest "$module_path" $VERBOSE; then
-                echo -e "${GREEN}✓ PASSED${NC}"
-                PASSED_TESTS+=("$test_file")
-            else
-                echo -e "${RED}✗ FAILED${NC}"
-                FAILED_TESTS+=("$test_file")
-            fi
+            echo -e "${YELLOW}Skipping: $test_file (not found)${NC}"
+            echo
         fi
-        echo
-    else
-        echo -e "${YELLOW}Skipping: $test_file (not found)${NC}"
-        echo
-    fi
-done
+    done
+fi
 
 # Summary
 echo -e "${BLUE}========================================${NC}"
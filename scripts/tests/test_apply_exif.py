@@ -5,15 +5,28 @@ Comprehensive test suite for apply_exif.py
 Tests all functions, parameter combinations, and edge cases for 100% code coverage.
 """
 
+import contextlib
+import io
 import os
 import sys
 import sqlite3
 import tempfile
 import shutil
+import struct
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call, mock_open
 import subprocess
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: property-based tests
+try:
+    from hypothesis import given, settings, strategies as st
+    HYPOTHESIS_AVAILABLE = True
+except ImportError:
+    HYPOTHESIS_AVAILABLE = False
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +35,75 @@ import apply_exif
 from media_utils import create_database_schema
 
 
+# Baseline 1x1 grayscale JPEG: SOI, JFIF, DQT, SOF0, DHT x2, SOS, EOI
+_JPEG_1x1 = (
+    b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'
+    b'\xff\xdb\x00C\x00' + b'\x01' * 64 +
+    b'\xff\xc0\x00\x0b\x08\x00\x01\x00\x01\x01\x01\x11\x00'
+    b'\xff\xc4\x00\x14\x00\x01' + b'\x00' * 16 +
+    b'\xff\xc4\x00\x14\x10\x01' + b'\x00' * 16 +
+    b'\xff\xda\x00\x08\x01\x01\x00\x00?\x00?\xff\xd9'
+)
+
+
+# Minimal MP4 with its moov atom after mdat, as phones and cameras write them:
+# ftyp, an 8-byte mdat payload, then moov holding a bare mvhd
+_MP4_MOOV_AFTER_MDAT = (
+    struct.pack('>I4s4sI4s', 20, b'ftyp', b'isom', 0x200, b'isom') +
+    struct.pack('>I4s', 16, b'mdat') + b'\x00' * 8 +
+    struct.pack('>I4sI4s', 116, b'moov', 108, b'mvhd') + b'\x00' * 4 +
+    struct.pack('>4I', 0, 0, 1000, 0) + struct.pack('>IH', 0x10000, 0x100) + b'\x00' * 10 +
+    struct.pack('>9I', 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000) +
+    b'\x00' * 24 + struct.pack('>I', 1)
+)
+
+
+# Keyword fixture shared by the keyword tests
+_KW_VBS = frozenset({"vacation", "beach", "sunset"})
+
+
+def _mock_location(address, latitude, longitude, elevation):
+    """Build a geopy-style location as returned by Nominatim.geocode"""
+    location = MagicMock()
+    location.latitude = latitude
+    location.longitude = longitude
+    location.raw = {'address': address, 'extratags': {'ele': str(elevation)}}
+    return location
+
+
+# Geocoder responses: query -> (address, latitude, longitude, elevation)
+_ADDRESSES = {
+    "New Delhi, India": (
+        {'city': 'New Delhi', 'state': 'Delhi', 'country': 'India', 'country_code': 'in'},
+        28.6139, 77.2090, 216),
+    "Fort Worth, Texas, USA": (
+        {'city': 'Fort Worth', 'state': 'Texas', 'country': 'United States', 'country_code': 'us'},
+        32.7555, -97.3308, 199),
+    "Queenstown, New Zealand": (
+        {'town': 'Queenstown', 'state': 'Otago', 'country': 'New Zealand', 'country_code': 'nz'},
+        -45.0312, 168.6626, 310),
+    "Kathmandu, Nepal": (
+        {'city': 'Kathmandu', 'state': 'Bagmati Province', 'country': 'Nepal', 'country_code': 'np'},
+        27.7172, 85.3240, 1400),
+}
+
+# Built once; MagicMock construction is comparatively expensive
+_MOCK_LOCS = {query: _mock_location(*fields) for query, fields in _ADDRESSES.items()}
+
+
+def _detect_exiftool() -> bool:
+    """Return True if an exiftool binary can be run"""
+    try:
+        subprocess.run(['exiftool', '-ver'], capture_output=True, check=True)
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+# Probed once at import rather than by every integration class
+_EXIFTOOL_AVAILABLE = _detect_exiftool()
+
+
 class TestApplyExifHelpers(unittest.TestCase):
     """Test helper functions in apply_exif.py"""
     
@@ -98,6 +180,30 @@ Caption-Abstract: Beautiful sunset
         cmd_str = ' '.join(cmd)
         self.assertIn('-XMP-dc:Subject=', cmd_str)
     
+    def test_build_exiftool_cmd_cached_matches_uncached(self):
+        """Test the memoized command builder matches build_exiftool_cmd"""
+        apply_exif._cached_tag_args.cache_clear()
+        tags = {'XMP-dc:Subject': ['vacation', 'beach'], 'GPSLatitude': 28.6139, 'Caption-Abstract': 'x'}
+        for files in (['/path/a.jpg'], ['/path/b.jpg', '/path/c.jpg']):
+            for dry_run in (False, True):
+                with self.subTest(files=files, dry_run=dry_run):
+                    self.assertEqual(apply_exif._build_exiftool_cmd_cached(files, tags, dry_run),
+                                     apply_exif.build_exiftool_cmd(files, tags, dry_run))
+        self.assertEqual(apply_exif._cached_tag_args.cache_info().misses, 2)
+        
+        # Unhashable values fall back to the uncached builder
+        tags = {'Caption-Abstract': {'unhashable': True}}
+        self.assertEqual(apply_exif._build_exiftool_cmd_cached(['/path/a.jpg'], tags, False),
+                         apply_exif.build_exiftool_cmd(['/path/a.jpg'], tags, False))
+    
+    def test_build_exiftool_cmd_cached_distinguishes_equal_values(self):
+        """Test True, 1 and 1.0 don't share a cache entry despite comparing equal"""
+        apply_exif._cached_tag_args.cache_clear()
+        for value in (True, 1, 1.0):
+            with self.subTest(value=value):
+                cmd = apply_exif._build_exiftool_cmd_cached(['/path/a.jpg'], {'Rating': value}, False)
+                self.assertIn(f'-Rating={value}', cmd)
+    
     def test_build_exiftool_cmd_multiple_files(self):
         """Test building command with multiple files"""
         files = ['/path/to/photo1.jpg', '/path/to/photo2.jpg']
@@ -171,6 +277,22 @@ class TestApplyExifExecution(unittest.TestCase):
         for verbose_level in [1, 2, 3]:
             result = apply_exif.run_exiftool(files, tags, dry_run=False, verbose=verbose_level)
             self.assertTrue(result)
+    
+    @patch('subprocess.run')
+    def test_run_exiftool_large_batch_uses_argfile(self, mock_run):
+        """Test long file lists are sent on stdin rather than argv"""
+        mock_run.return_value = MagicMock(returncode=0, stdout='2000 image files updated\n', stderr='')
+        
+        files = [f'/path/to/album/photo_{i:05d}.jpg' for i in range(2000)]
+        tags = {'XMP-dc:Subject': ['batch', 'album']}
+        result = apply_exif.run_exiftool(files, tags, dry_run=False, verbose=0)
+        
+        self.assertTrue(result)
+        args, kwargs = mock_run.call_args
+        self.assertEqual(args[0], ['exiftool', '-@', '-'])
+        argfile_lines = kwargs['input'].splitlines()
+        self.assertEqual(argfile_lines[-len(files):], files)
+        self.assertIn('#[CSTR]-XMP-dc:Subject=batch\\nalbum', argfile_lines)
 
 
 class TestApplyExifKeywords(unittest.TestCase):
@@ -189,9 +311,29 @@ class TestApplyExifKeywords(unittest.TestCase):
         keywords = apply_exif.get_existing_keywords('/path/to/photo.jpg')
         
         self.assertIn('XMP-dc:Subject', keywords)
-        self.assertIn('vacation', keywords['XMP-dc:Subject'])
-        self.assertIn('beach', keywords['XMP-dc:Subject'])
-        self.assertIn('sunset', keywords['XMP-dc:Subject'])
+        self.assertEqual(set(keywords['XMP-dc:Subject']), _KW_VBS)
+    
+    @patch('apply_exif.ORJSON_AVAILABLE', False)
+    @patch('subprocess.run')
+    def test_get_existing_keywords_bytes_stdlib_json(self, mock_run):
+        """Test raw exiftool bytes parse without orjson installed"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='[{"IPTC:Keywords": ["caf\u00e9", "beach"]}]'.encode('utf-8'),
+            stderr=b''
+        )
+        
+        keywords = apply_exif.get_existing_keywords('/path/to/photo.jpg')
+        
+        self.assertEqual(keywords['IPTC:Keywords'], ['beach', 'caf\u00e9'])
+    
+    def test_normalize_keywords(self):
+        """Test keyword normalization dedupes, strips and sorts"""
+        expected = sorted(_KW_VBS)
+        self.assertEqual(apply_exif._normalize_keywords("vacation, beach,,sunset , beach"), expected)
+        self.assertEqual(apply_exif._normalize_keywords([" vacation", "beach", "sunset", "", "beach"]), expected)
+        self.assertEqual(apply_exif._normalize_keywords(_KW_VBS), expected)
+        self.assertEqual(apply_exif._normalize_keywords(None), [])
     
     @patch('subprocess.run')
     def test_get_existing_keywords_no_keywords(self, mock_run):
@@ -216,6 +358,73 @@ class TestApplyExifKeywords(unittest.TestCase):
         
         self.assertEqual(keywords['XMP-dc:Subject'], [])
         self.assertEqual(keywords['IPTC:Keywords'], [])
+    
+    @patch('subprocess.run')
+    def test_get_existing_keywords_fast_read_only_for_jpeg_tiff(self, mock_run):
+        """Test -fast2 is never sent for videos, whose XMP may follow mdat"""
+        mock_run.return_value = MagicMock(returncode=0, stdout='', stderr='')
+        
+        apply_exif.get_existing_keywords('/path/to/photo.JPG')
+        self.assertIn('-fast2', mock_run.call_args[0][0])
+        
+        for path in ('/path/to/clip.mov', '/path/to/clip.mp4', '/path/to/image.heic'):
+            apply_exif.get_existing_keywords(path)
+            self.assertNotIn('-fast2', mock_run.call_args[0][0], path)
+        
+        apply_exif.get_existing_keywords_batch(['/path/to/photo.jpg', '/path/to/clip.mov'])
+        self.assertNotIn('-fast2', mock_run.call_args[0][0])
+    
+    @patch('subprocess.run')
+    def test_get_existing_keywords_batch(self, mock_run):
+        """Test reading keywords for several files in one exiftool call"""
+        mock_run.return_value = MagicMock(
+            returncode=1,
+            stdout=json.dumps([
+                {"SourceFile": "/path/to/a.jpg", "XMP:Subject": ["beach", "vacation"]},
+                {"SourceFile": "/path/to/b.jpg", "IPTC:Keywords": "sunset"},
+            ]),
+            stderr='Error: File not found - /path/to/missing.jpg'
+        )
+        
+        keywords = apply_exif.get_existing_keywords_batch(
+            ['/path/to/a.jpg', '/path/to/b.jpg', '/path/to/missing.jpg'])
+        
+        mock_run.assert_called_once()
+        self.assertEqual(keywords['/path/to/a.jpg']['XMP-dc:Subject'], ['beach', 'vacation'])
+        self.assertEqual(keywords['/path/to/b.jpg']['IPTC:Keywords'], ['sunset'])
+        self.assertNotIn('/path/to/missing.jpg', keywords)
+
+
+class TestApplyExifKeywordMerge(unittest.TestCase):
+    """Test merging --add-keyword/--remove-keyword into existing keywords"""
+    
+    def test_merge_keywords(self):
+        """Test additions are merged, duplicates collapse and removals win"""
+        cases = [
+            ([], {'First'}, set(), ['First']),
+            (['First'], {'First'}, set(), ['First']),
+            (['First', 'Second'], {'Third', 'First'}, {'Second'}, ['First', 'Third']),
+            (['vacation'], {'beach'}, {'beach'}, ['vacation']),
+            (sorted(_KW_VBS), set(), set(_KW_VBS), []),
+        ]
+        for existing, to_add, to_remove, expected in cases:
+            with self.subTest(existing=existing, to_add=to_add, to_remove=to_remove):
+                self.assertEqual(apply_exif.merge_keywords(existing, to_add, to_remove), expected)
+    
+    if HYPOTHESIS_AVAILABLE:
+        keyword_sets = st.frozensets(st.text(max_size=8), max_size=6)
+        
+        @settings(max_examples=100, deadline=None)
+        @given(existing=st.lists(st.text(max_size=8), max_size=6),
+               to_add=keyword_sets, to_remove=keyword_sets)
+        def test_merge_keywords_properties(self, existing, to_add, to_remove):
+            """Test merge invariants over generated keyword sets"""
+            result = apply_exif.merge_keywords(existing, to_add, to_remove)
+            
+            self.assertEqual(result, sorted(set(result)))
+            self.assertTrue(set(to_add) - set(to_remove) <= set(result))
+            self.assertTrue(set(result).isdisjoint(to_remove))
+            self.assertTrue(set(result) <= set(existing) | set(to_add))
 
 
 class TestApplyExifVerification(unittest.TestCase):
@@ -235,6 +444,46 @@ class TestApplyExifVerification(unittest.TestCase):
         
         self.assertTrue(result)
     
+    @patch('subprocess.run')
+    def test_get_tag_value(self, mock_run):
+        """Test a single tag is read as its bare -s3 value"""
+        mock_run.return_value = MagicMock(returncode=0, stdout='Fort Worth\n', stderr='')
+        
+        value = apply_exif.get_tag_value('/path/to/photo.jpg', 'XMP-photoshop:City')
+        
+        self.assertEqual(value, 'Fort Worth')
+        cmd = mock_run.call_args.args[0]
+        self.assertIn('-s3', cmd)
+        self.assertEqual(cmd[-2:], ['-XMP-photoshop:City', '/path/to/photo.jpg'])
+        self.assertEqual(mock_run.call_args.kwargs['timeout'], 5)
+    
+    def test_get_tag_value_session_timeout_and_trace(self):
+        """Test a session read is time-limited and shows stderr at verbose 3"""
+        session = MagicMock()
+        session.execute.return_value = ('Fort Worth\n', 'Warning: minor issue\n')
+        
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            value = apply_exif.get_tag_value('/path/to/photo.jpg', 'XMP-photoshop:City',
+                                             session=session, verbose=3)
+        
+        self.assertEqual(value, 'Fort Worth')
+        self.assertEqual(session.execute.call_args.kwargs['timeout'], 5)
+        self.assertIn('exiftool -s3 -XMP-photoshop:City /path/to/photo.jpg', stdout.getvalue())
+        self.assertIn("stderr: 'Warning: minor issue'", stdout.getvalue())
+    
+    def test_verify_exif_written_session_timeout(self):
+        """Test a stuck session read falls back to assuming success"""
+        session = MagicMock()
+        session.execute.side_effect = subprocess.TimeoutExpired(['exiftool'], 5)
+        
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            result = apply_exif.verify_exif_written('/path/to/photo.jpg', {'GPSLatitude': '32.7157'},
+                                                    session=session)
+        
+        self.assertTrue(result)
+        self.assertIn('Could not verify EXIF write', stderr.getvalue())
+    
     @patch('subprocess.run')
     def test_verify_exif_written_no_tags(self, mock_run):
         """Test verification with no verifiable tags"""
@@ -279,12 +528,13 @@ class TestApplyExifDatabase(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.db_path = os.path.join(self.temp_dir, "test.db")
         self.conn = sqlite3.connect(self.db_path)
-        create_database_schema(self.conn)
+        # Throwaway database: WAL skips the per-commit sync of the main file
+        create_database_schema(self.conn, wal=True)
     
     def tearDown(self):
         """Clean up"""
         self.conn.close()
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_check_file_in_database_exists(self):
         """Test checking if file exists in database"""
@@ -387,7 +637,7 @@ class TestApplyExifFileResolution(unittest.TestCase):
     
     def tearDown(self):
         """Clean up"""
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_resolve_files_explicit(self):
         """Test resolving explicitly specified files"""
@@ -458,6 +708,26 @@ class TestApplyExifManualLocation(unittest.TestCase):
         self.assertEqual(metadata['GPSLongitudeRef'], 'W')   # Reference indicates direction
         self.assertEqual(metadata['GPSAltitude'], 200.0)
     
+    def test_create_exif_metadata_from_manual_params_southern_hemisphere(self):
+        """Test negative latitude and longitude become S/W refs before any write"""
+        metadata = apply_exif.create_exif_metadata_from_manual_params(
+            latitude=-45.0312,
+            longitude=-68.3,
+            altitude=None,
+            city=None,
+            state=None,
+            country=None,
+            country_code=None,
+            coverage=None,
+            date_str="",
+            offset_str=""
+        )
+        
+        self.assertEqual(metadata['GPSLatitude'], 45.0312)
+        self.assertEqual(metadata['GPSLatitudeRef'], 'S')
+        self.assertEqual(metadata['GPSLongitude'], 68.3)
+        self.assertEqual(metadata['GPSLongitudeRef'], 'W')
+    
     def test_create_exif_metadata_from_manual_params_location_only(self):
         """Test creating metadata with location text only"""
         metadata = apply_exif.create_exif_metadata_from_manual_params(
@@ -500,6 +770,171 @@ class TestApplyExifManualLocation(unittest.TestCase):
         self.assertEqual(metadata['OffsetTimeOriginal'], "-06:00")
 
 
+class TestApplyExifGeocodeCache(unittest.TestCase):
+    """Test memoization of geocoded place names"""
+
+    LOCATION_TAGS = {
+        'GPSLatitude': 28.6139,
+        'GPSLatitudeRef': 'N',
+        'GPSLongitude': 77.209,
+        'GPSLongitudeRef': 'E',
+        'XMP-dc:Coverage': 'New Delhi, India',
+    }
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, "geocode.json")
+        patcher = patch('apply_exif.GEOCODE_CACHE_FILE', self.cache_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._reset_cache()
+        self.addCleanup(self._reset_cache)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _reset_cache(self):
+        apply_exif._cached_location_tags.cache_clear()
+        apply_exif._geocode_disk_cache = None
+
+    def test_geocode_called_once_per_place(self):
+        """Test repeated lookups of the same place reuse the first result"""
+        with patch('apply_exif._geocode_location_tags', return_value=dict(self.LOCATION_TAGS)) as mock_geo:
+            first = apply_exif.create_exif_metadata("New Delhi, India", "2024:01:01 12:00:00", "+05:30")
+            second = apply_exif.create_exif_metadata("New Delhi, India")
+
+        mock_geo.assert_called_once_with("New Delhi, India")
+        self.assertEqual(first['OffsetTimeOriginal'], "+05:30")
+        self.assertNotIn('OffsetTimeOriginal', second)
+        self.assertEqual(second['GPSLatitude'], 28.6139)
+
+    def test_geocode_cache_persists_to_disk(self):
+        """Test a new process reads cached locations instead of geocoding"""
+        with patch('apply_exif._geocode_location_tags', return_value=dict(self.LOCATION_TAGS)):
+            apply_exif.create_exif_metadata("New Delhi, India")
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        self._reset_cache()
+        with patch('apply_exif._geocode_location_tags') as mock_geo:
+            metadata = apply_exif.create_exif_metadata("New Delhi, India")
+
+        mock_geo.assert_not_called()
+        self.assertEqual(metadata['XMP-dc:Coverage'], "New Delhi, India")
+
+    def test_geocode_failure_not_cached(self):
+        """Test a failed lookup is retried on the next call"""
+        with patch('apply_exif._geocode_location_tags', side_effect=ValueError("no match")) as mock_geo:
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    apply_exif.create_exif_metadata("Nowhere")
+        self.assertEqual(mock_geo.call_count, 2)
+
+    def test_geocode_cache_other_version_ignored(self):
+        """Test a cache file from another schema version is geocoded again"""
+        for data in ({"New Delhi, India": {"GPSLatitude": 0}},
+                     {"version": apply_exif.GEOCODE_CACHE_VERSION + 1,
+                      "places": {"New Delhi, India": {"GPSLatitude": 0}}}):
+            with self.subTest(data=data):
+                with open(self.cache_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                self._reset_cache()
+                with patch('apply_exif._geocode_location_tags', return_value=dict(self.LOCATION_TAGS)) as mock_geo:
+                    metadata = apply_exif.create_exif_metadata("New Delhi, India")
+
+                mock_geo.assert_called_once_with("New Delhi, India")
+                self.assertEqual(metadata['GPSLatitude'], 28.6139)
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                self.assertEqual(saved["version"], apply_exif.GEOCODE_CACHE_VERSION)
+                self.assertEqual(saved["places"]["New Delhi, India"], self.LOCATION_TAGS)
+
+    def _run_main_with_place(self, *options):
+        """Run main() for one place with geocoding and exiftool mocked"""
+        test_file = os.path.join(self.test_dir, 'test.jpg')
+        Path(test_file).touch()
+        with patch('apply_exif._geocode_location_tags', return_value=dict(self.LOCATION_TAGS)), \
+                patch('apply_exif.run_exiftool', return_value=True), \
+                patch('sys.argv', ['apply_exif.py', '--dry-run',
+                                   '--files', test_file,
+                                   '--place', 'New Delhi, India', *options]):
+            apply_exif.main()
+
+    def test_main_geocode_cache_option(self):
+        """Test --geocode-cache writes the cache to the given file"""
+        other_file = os.path.join(self.test_dir, "other.json")
+        self._run_main_with_place('--geocode-cache', other_file)
+
+        self.assertTrue(os.path.exists(other_file))
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_main_no_geocode_cache_option(self):
+        """Test --no-geocode-cache neither reads nor writes a cache file"""
+        self._run_main_with_place('--no-geocode-cache')
+
+        self.assertIsNone(apply_exif.GEOCODE_CACHE_FILE)
+        self.assertEqual(os.listdir(self.test_dir), ['test.jpg'])
+
+
+@unittest.skipUnless(apply_exif.LOCATION_AVAILABLE, "geopy/requests not installed")
+class TestApplyExifGeocodedMetadata(unittest.TestCase):
+    """Test create_exif_metadata against canned Nominatim responses"""
+    
+    # (query, UTC offset, expected country code)
+    CASES = [
+        ("New Delhi, India", "+05:30", "IN"),
+        ("Fort Worth, Texas, USA", "-06:00", "US"),
+        ("Queenstown, New Zealand", "+13:00", "NZ"),
+        ("Kathmandu, Nepal", "+05:45", "NP"),
+    ]
+    
+    @classmethod
+    def setUpClass(cls):
+        """Patch the geocoder once for every case"""
+        patcher = patch('apply_exif.GEOCODE_CACHE_FILE', None)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        patcher = patch('location_utils.Nominatim')
+        mock_nominatim = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        mock_nominatim.return_value.geocode.side_effect = \
+            lambda query, **kwargs: _MOCK_LOCS.get(query)
+        
+        cls._clear_caches()
+        cls.addClassCleanup(cls._clear_caches)
+    
+    @staticmethod
+    def _clear_caches():
+        """Drop geocoder results memoized with or without the mock"""
+        import location_utils
+        location_utils.geocode_place.cache_clear()
+        apply_exif._cached_location_tags.cache_clear()
+        apply_exif._geocode_disk_cache = None
+    
+    def test_cities(self):
+        """Test GPS, address, date and offset tags for each city"""
+        for query, offset, country_code in self.CASES:
+            address, lat, lon, elevation = _ADDRESSES[query]
+            with self.subTest(query=query):
+                metadata = apply_exif.create_exif_metadata(query, "2026:01:01 12:00:00", offset)
+                
+                self.assertAlmostEqual(metadata['GPSLatitude'], abs(lat))
+                self.assertEqual(metadata['GPSLatitudeRef'], 'N' if lat >= 0 else 'S')
+                self.assertAlmostEqual(metadata['GPSLongitude'], abs(lon))
+                self.assertEqual(metadata['GPSLongitudeRef'], 'E' if lon >= 0 else 'W')
+                self.assertEqual(metadata['GPSAltitude'], float(elevation))
+                
+                self.assertEqual(metadata['XMP-photoshop:City'], address.get('city') or address.get('town'))
+                self.assertEqual(metadata['XMP-photoshop:State'], address['state'])
+                self.assertEqual(metadata['XMP-photoshop:Country'], address['country'])
+                self.assertEqual(metadata['XMP-iptcExt:LocationShownCountryCode'], country_code)
+                self.assertEqual(metadata['XMP-dc:Coverage'], query)
+                
+                self.assertEqual(metadata['DateTimeOriginal'], "2026:01:01 12:00:00")
+                self.assertEqual(metadata['OffsetTimeOriginal'], offset)
+                self.assertEqual(metadata['OffsetTimeDigitized'], offset)
+
+
 class TestApplyExifCommandLine(unittest.TestCase):
     """Test command-line integration"""
     
@@ -512,7 +947,7 @@ class TestApplyExifCommandLine(unittest.TestCase):
     
     def tearDown(self):
         """Clean up"""
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     @patch('apply_exif.run_exiftool')
     def test_main_dry_run(self, mock_run):
@@ -551,6 +986,29 @@ class TestApplyExifCommandLine(unittest.TestCase):
             
             mock_geo.assert_called_once()
     
+    @patch('apply_exif.ExifToolSession')
+    @patch('apply_exif.run_exiftool')
+    def test_main_legacy_patterns_share_session(self, mock_run, mock_session_cls):
+        """Test legacy PATTERN_TAG_MAP writes go through one exiftool session"""
+        mock_run.return_value = True
+        other_file = os.path.join(self.temp_dir, "photo.png")
+        Path(other_file).write_bytes(b"test")
+        pattern_map = {
+            os.path.join(self.temp_dir, "*.jpg"): "jpeg",
+            os.path.join(self.temp_dir, "*.png"): "png",
+        }
+        
+        with patch.dict('apply_exif.PATTERN_TAG_MAP', pattern_map, clear=True), \
+                patch('sys.argv', ['apply_exif.py']):
+            apply_exif.main()
+        
+        session = mock_session_cls.return_value
+        mock_session_cls.assert_called_once()
+        self.assertEqual(mock_run.call_count, 2)
+        for call_args in mock_run.call_args_list:
+            self.assertIs(call_args.kwargs['session'], session)
+        session.close.assert_called_once()
+    
     @patch('apply_exif.run_exiftool')
     def test_main_with_keywords(self, mock_run):
         """Test main function with keyword manipulation"""
@@ -631,5 +1089,634 @@ class TestApplyExifCommandLine(unittest.TestCase):
         self.assertEqual(mock_run.call_count, 1)
 
 
+# Minimal stand-in for ``exiftool -stay_open True -@ -``: answers each
+# -execute block with its arguments on stdout, then the -echo4 sentinel on
+# stderr. "-noisy" first floods stderr well past a pipe buffer, and writes
+# near-miss copies of the sentinel to stdout; "-hang" never answers.
+_FAKE_EXIFTOOL = '''#!/usr/bin/env python3
+import os, re, sys, time
+args, echo4 = [], None
+log = os.environ.get("FAKE_EXIFTOOL_LOG")
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if args and args[-1] == "-stay_open" and line == "False":
+        sys.exit(0)
+    if args and args[-1] == "-echo4":
+        args.pop()
+        echo4 = line
+        continue
+    if re.match(r"-execute\\d*$", line):
+        if "-hang" in args:
+            time.sleep(60)
+        if "-die" in args:
+            sys.exit(1)
+        # FILE.die holds how many more times to exit on a command naming FILE
+        for arg in args:
+            if os.path.exists(arg + ".die"):
+                with open(arg + ".die") as f:
+                    deaths = int(f.read())
+                if deaths <= 1:
+                    os.remove(arg + ".die")
+                else:
+                    with open(arg + ".die", "w") as f:
+                        f.write(str(deaths - 1))
+                sys.exit(1)
+        if log:
+            with open(log, "a") as f:
+                f.write(" ".join(args) + "\\n")
+        if "-noisy" in args:
+            sys.stderr.write("warning: noise\\n" * 20000)
+            sys.stdout.write("x%s\\n%s1\\n" % (echo4, echo4))
+        sys.stdout.write(" ".join(args) + "\\n" + echo4 + "\\n")
+        sys.stdout.flush()
+        sys.stderr.write(echo4 + "\\n")
+        sys.stderr.flush()
+        args = []
+        continue
+    args.append(line)
+'''
+
+
+@unittest.skipIf(sys.platform == 'win32', "fake exiftool is a shebang script")
+class TestExifToolSession(unittest.TestCase):
+    """Test the stay_open protocol against a scripted exiftool"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.executable = os.path.join(self.temp_dir, 'exiftool')
+        with open(self.executable, 'w') as f:
+            f.write(_FAKE_EXIFTOOL)
+        os.chmod(self.executable, 0o755)
+        self.session = apply_exif.ExifToolSession(self.executable)
+        self.addCleanup(self.session.close)
+    
+    def test_execute_returns_output_before_sentinel(self):
+        """Test each command gets its own output, in order"""
+        self.assertEqual(self.session.execute(['-ver']), ("-ver\n", ""))
+        results = self.session.execute_many([['-a'], ['-b']])
+        self.assertEqual(results, [("-a\n", ""), ("-b\n", "")])
+    
+    def test_large_stderr_does_not_deadlock(self):
+        """Test stderr larger than a pipe buffer is drained while stdout is awaited"""
+        stdout, stderr = self.session.execute(['-noisy'])
+        
+        self.assertEqual(len(stderr), len("warning: noise\n") * 20000)
+        self.assertTrue(stdout.endswith("-noisy\n"))
+        # Lines that merely contain the sentinel do not end the response
+        self.assertIn("x{ready1}\n{ready1}1\n", stdout)
+        self.assertEqual(self.session.execute(['-ver']), ("-ver\n", ""))
+    
+    def test_timeout_restarts_exiftool(self):
+        """Test a command that never answers times out and leaves a working session"""
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.session.execute(['-hang'], timeout=0.5)
+        
+        self.assertEqual(self.session.execute(['-ver'], timeout=5), ("-ver\n", ""))
+    
+    def test_batch_keyword_read_restarts_dead_session(self):
+        """Test a session that dies mid-read is restarted, not left dead"""
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            # A file argument of "-die" makes the fake exiftool exit
+            result = apply_exif.get_existing_keywords_batch(['-die'], session=self.session)
+        
+        self.assertEqual(result, {})
+        self.assertIn('exiftool session terminated unexpectedly', stderr.getvalue())
+        self.assertEqual(self.session.execute(['-ver'], timeout=5), ("-ver\n", ""))
+    
+    def test_batch_keyword_read_restarts_session_on_os_error(self):
+        """Test a broken pipe to the session also restarts it"""
+        with patch.object(self.session, 'execute', side_effect=BrokenPipeError(32, 'Broken pipe')), \
+                patch.object(self.session, 'restart', wraps=self.session.restart) as mock_restart, \
+                contextlib.redirect_stderr(io.StringIO()):
+            result = apply_exif.get_existing_keywords_batch(['a.jpg'], session=self.session)
+        
+        self.assertEqual(result, {})
+        mock_restart.assert_called_once_with()
+        self.assertEqual(self.session.execute(['-ver'], timeout=5), ("-ver\n", ""))
+    
+    def test_batch_keyword_read_bad_json_keeps_session(self):
+        """Test unparseable output is left to the per-file fallback, no restart"""
+        with patch.object(self.session, 'restart') as mock_restart:
+            result = apply_exif.get_existing_keywords_batch(['a.jpg'], session=self.session)
+        
+        # The fake exiftool echoes its arguments instead of JSON
+        self.assertEqual(result, {})
+        mock_restart.assert_not_called()
+    
+    def _mark_to_die(self, path, times):
+        """Make the fake exiftool exit the next ``times`` commands naming ``path``"""
+        with open(path + '.die', 'w') as f:
+            f.write(str(times))
+    
+    def test_execute_retries_after_exiftool_exits(self):
+        """Test a command is rerun on a fresh process if exiftool exited"""
+        path = os.path.join(self.temp_dir, 'a.jpg')
+        self._mark_to_die(path, 1)
+        self.assertEqual(self.session.execute([path]), (path + "\n", ""))
+        
+        # A process that already exited fails on the write and is replaced too
+        self.session._proc.kill()
+        self.session._proc.wait()
+        self.assertEqual(self.session.execute(['-ver']), ("-ver\n", ""))
+        
+        with self.assertRaises(apply_exif.ExifToolSessionError):
+            self.session.execute(['-die'])
+        self.assertEqual(self.session.execute(['-ver']), ("-ver\n", ""))
+    
+    def _run_main_with_session(self, files):
+        """Run main() writing a title to ``files`` through the fake exiftool
+        
+        Returns (commands the fake exiftool ran, stderr).
+        """
+        log = os.path.join(self.temp_dir, 'commands.log')
+        real_session = apply_exif.ExifToolSession
+        stderr = io.StringIO()
+        with patch.dict(os.environ, {'FAKE_EXIFTOOL_LOG': log}), \
+                patch('apply_exif.ExifToolSession', lambda: real_session(self.executable)), \
+                patch('sys.argv', ['apply_exif.py', '--set', 'XMP-dc:Title=Trip',
+                                   *[arg for f in files for arg in ('--files', f)]]), \
+                contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+            apply_exif.main()
+        with open(log) as f:
+            return f.read().splitlines(), stderr.getvalue()
+    
+    def test_main_survives_exiftool_exit(self):
+        """Test exiftool dying partway through main() does not fail the rest"""
+        files = [os.path.join(self.temp_dir, name) for name in ('a.jpg', 'b.jpg', 'c.jpg')]
+        for path in files:
+            Path(path).touch()
+        self._mark_to_die(files[1], 1)
+        
+        commands, stderr = self._run_main_with_session(files)
+        
+        for path in files:
+            self.assertEqual(sum(cmd.endswith(path) for cmd in commands), 1, path)
+        self.assertNotIn('Failed to write', stderr)
+    
+    @patch('apply_exif.subprocess.run')
+    def test_main_drops_session_that_keeps_dying(self, mock_run):
+        """Test main() falls back to per-call exiftool when a restart dies too"""
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="1 image files updated\n", stderr="")
+        files = [os.path.join(self.temp_dir, name) for name in ('a.jpg', 'b.jpg', 'c.jpg')]
+        for path in files:
+            Path(path).touch()
+        self._mark_to_die(files[1], 2)
+        
+        commands, stderr = self._run_main_with_session(files)
+        
+        self.assertEqual(len(commands), 1)
+        self.assertTrue(commands[0].endswith(files[0]))
+        self.assertIn('continuing without it', stderr)
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args[0][0][-1], files[2])
+
+
+class ExifToolPool:
+    """Several ``apply_exif.ExifToolSession`` processes shared between threads
+    
+    A session runs one command at a time, so concurrent callers each check out
+    an idle one. Sessions start on demand, up to ``size``, and the pool can be
+    passed wherever a ``session`` is accepted. apply_exif itself handles one
+    file at a time, so only the integration tests below need this.
+    """
+    
+    def __init__(self, size=None):
+        self._size = size or os.cpu_count() or 1
+        self._sessions = []
+        self._idle = []
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    @contextlib.contextmanager
+    def session(self):
+        """Check out an idle session for the duration of the block
+        
+        A session whose block raised may be dead or mid-response, so it is
+        shut down instead of being handed to the next caller.
+        """
+        session = self._acquire()
+        try:
+            yield session
+        except BaseException:
+            self._release(session, reuse=False)
+            raise
+        self._release(session, reuse=True)
+    
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("exiftool pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._sessions) < self._size:
+                    session = apply_exif.ExifToolSession("exiftool")
+                    self._sessions.append(session)
+                    return session
+                self._cond.wait()
+    
+    def _release(self, session, reuse):
+        with self._cond:
+            if reuse and not self._closed:
+                self._idle.append(session)
+                self._cond.notify()
+                return
+            self._sessions.remove(session)
+            # Frees a slot for a waiter, or wakes it to see the pool closed
+            self._cond.notify()
+        session.close()
+    
+    def execute(self, args, timeout=None):
+        """Run one command on an idle session"""
+        with self.session() as session:
+            return session.execute(args, timeout=timeout)
+    
+    def execute_many(self, commands):
+        """Pipeline commands on one idle session"""
+        with self.session() as session:
+            return session.execute_many(commands)
+    
+    def close(self):
+        """Shut down idle sessions now and checked-out ones when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for session in idle:
+                self._sessions.remove(session)
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+
+class TestExifToolPool(unittest.TestCase):
+    """Test session checkout in the integration tests' ExifToolPool"""
+    
+    def setUp(self):
+        patcher = patch('apply_exif.ExifToolSession', side_effect=lambda executable: MagicMock())
+        self.mock_session_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_sessions_started_on_demand(self):
+        """Test sequential use reuses one session and close shuts down all"""
+        pool = ExifToolPool(size=2)
+        
+        pool.execute(['-ver'])
+        pool.execute(['-ver'])
+        self.assertEqual(self.mock_session_cls.call_count, 1)
+        
+        # A second session starts only while the first is checked out
+        with pool.session() as first:
+            with pool.session() as second:
+                self.assertIsNot(first, second)
+        self.assertEqual(self.mock_session_cls.call_count, 2)
+        
+        pool.close()
+        first.close.assert_called_once()
+        second.close.assert_called_once()
+    
+    def test_failed_session_is_closed_and_replaced(self):
+        """Test a session that raised is shut down and never handed out again"""
+        pool = ExifToolPool(size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.session() as dead:
+                raise RuntimeError("exiftool session terminated unexpectedly")
+        dead.close.assert_called_once()
+        
+        # The slot it held is free for a fresh session
+        with pool.session() as fresh:
+            self.assertIsNot(fresh, dead)
+        pool.close()
+    
+    def test_close_shuts_down_checked_out_session_on_return(self):
+        """Test close() reaches sessions that were checked out at the time"""
+        pool = ExifToolPool(size=1)
+        with pool.session() as busy:
+            pool.close()
+            busy.close.assert_not_called()
+        busy.close.assert_called_once()
+        
+        with self.assertRaises(RuntimeError):
+            pool.execute(['-ver'])
+
+
+# One exiftool pool shared by every integration class in this module; it
+# starts a process only when a caller finds every existing one busy
+# Per process, so each pytest-xdist worker holds its own pool and files
+_POOL = None
+_PRISTINE_DIR = None
+
+
+def _shared_pool():
+    """Create the module's exiftool pool on first use"""
+    global _POOL
+    if _POOL is None:
+        _POOL = ExifToolPool()
+    return _POOL
+
+
+def _pristine_image():
+    """Write the untouched JPEG once per module and return its path"""
+    global _PRISTINE_DIR
+    if _PRISTINE_DIR is None:
+        _PRISTINE_DIR = tempfile.mkdtemp()
+        Path(_PRISTINE_DIR, "pristine.jpg").write_bytes(_JPEG_1x1)
+    return os.path.join(_PRISTINE_DIR, "pristine.jpg")
+
+
+def tearDownModule():
+    """Shut down the shared exiftool pool and remove the pristine JPEG"""
+    global _POOL, _PRISTINE_DIR
+    if _POOL is not None:
+        _POOL.close()
+        _POOL = None
+    if _PRISTINE_DIR is not None:
+        shutil.rmtree(_PRISTINE_DIR, ignore_errors=True)
+        _PRISTINE_DIR = None
+
+
+@unittest.skipUnless(_EXIFTOOL_AVAILABLE, "exiftool not available")
+class _ExifIntegrationBase(unittest.TestCase):
+    """Fixtures for round-trip tests against a real exiftool
+    
+    Each class gets its own working directory; all of them copy the same
+    pristine JPEG and talk to the same persistent exiftool pool.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Attach to the shared exiftool pool and pristine JPEG"""
+        cls.et = _shared_pool()
+        cls._template = _pristine_image()
+        cls._root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the fixtures"""
+        shutil.rmtree(cls._root, ignore_errors=True)
+    
+    def setUp(self):
+        """Copy the pristine template for this test to modify"""
+        self.test_image = os.path.join(self._root, f"{self._testMethodName}.jpg")
+        shutil.copyfile(self._template, self.test_image)
+    
+    def tearDown(self):
+        """Clean up"""
+        Path(self.test_image).unlink(missing_ok=True)
+    
+    def _read_json(self, *tags, options=()):
+        """Read tags back through the session as a JSON dict"""
+        stdout, _ = self.et.execute(['-fast2', '-json', *options] + [f'-{t}' for t in tags] + [self.test_image])
+        return json.loads(stdout)[0]
+
+
+class TestIntegrationWithExiftool(_ExifIntegrationBase):
+    """Round-trip keyword and caption writes through the persistent session"""
+    
+    def test_write_and_read_keywords(self):
+        """Test list-valued keywords survive the argfile protocol"""
+        tags = {
+            'XMP-dc:Subject': ['vacation', 'beach', 'sunset'],
+            'IPTC:Keywords': ['vacation', 'beach', 'sunset'],
+        }
+        result = apply_exif.run_exiftool([self.test_image], tags, dry_run=False, session=self.et)
+        self.assertTrue(result)
+        
+        keywords = apply_exif.get_existing_keywords(self.test_image, session=self.et)
+        self.assertEqual(keywords['XMP-dc:Subject'], ['beach', 'sunset', 'vacation'])
+        self.assertEqual(keywords['IPTC:Keywords'], ['beach', 'sunset', 'vacation'])
+    
+    def test_multiline_caption(self):
+        """Test values containing newlines are sent intact"""
+        caption = 'First line\nSecond line'
+        apply_exif.run_exiftool([self.test_image], {'Caption-Abstract': caption},
+                                dry_run=False, session=self.et)
+        
+        metadata = self._read_json('Caption-Abstract')
+        self.assertEqual(metadata.get('Caption-Abstract'), caption)
+    
+    def test_many_commands_one_session(self):
+        """Test sequential commands get their own responses"""
+        for i in range(5):
+            apply_exif.run_exiftool([self.test_image], {'Caption-Abstract': f'caption {i}'},
+                                    dry_run=False, session=self.et)
+            self.assertEqual(apply_exif.get_tag_value(self.test_image, 'Caption-Abstract', session=self.et),
+                             f'caption {i}')
+    
+    def _read_subject(self):
+        """Read XMP-dc:Subject back from the test image"""
+        stdout, _ = self.et.execute(['-json', '-XMP-dc:Subject', self.test_image])
+        written = json.loads(stdout)[0].get('Subject', [])
+        return [written] if isinstance(written, str) else written
+    
+    def _apply_keyword_steps(self, steps):
+        """Run apply_exif once per (op, keywords, expected) step.
+        
+        main() reads the file's keywords, merges in the step's change and
+        writes the result; after each step the keywords on disk must equal
+        ``expected``.
+        """
+        for i, (op, keywords, expected) in enumerate(steps):
+            flag = '--add-keyword' if op == 'add' else '--remove-keyword'
+            argv = ['apply_exif.py', '--files', self.test_image]
+            for keyword in sorted(keywords):
+                argv += [flag, keyword]
+            with patch('sys.argv', argv):
+                apply_exif.main()
+            
+            self.assertCountEqual(self._read_subject(), expected, f"after step {i}")
+    
+    def test_keyword_workflow(self):
+        """Test adds and removes across steps leave the merged keyword set"""
+        self._apply_keyword_steps([
+            ('add', {'First'}, ['First']),
+            ('add', {'First'}, ['First']),  # Re-adding doesn't duplicate
+            ('add', {'Second'}, ['First', 'Second']),
+            ('add', {'Third', 'First'}, ['First', 'Second', 'Third']),
+            ('remove', {'Second'}, ['First', 'Third']),
+            ('remove', {'Missing'}, ['First', 'Third']),
+        ])
+    
+    def test_batch_write_many_files(self):
+        """Test one exiftool call tags every file in a batch"""
+        batch = [os.path.join(self._root, f"batch_{i}.jpg") for i in range(50)]
+        for path in batch:
+            shutil.copyfile(self._template, path)
+            self.addCleanup(Path(path).unlink, missing_ok=True)
+        
+        apply_exif.run_exiftool(batch, {'XMP-dc:Subject': ['batch']}, dry_run=False)
+        
+        stdout, _ = self.et.execute(['-json', '-XMP-dc:Subject'] + batch)
+        written = {os.path.normpath(r['SourceFile']): r.get('Subject') for r in json.loads(stdout)}
+        self.assertEqual(len(written), len(batch))
+        for path in batch:
+            self.assertEqual(written[os.path.normpath(path)], 'batch')
+    
+    def test_concurrent_writes_through_pool(self):
+        """Test threads writing through the shared pool each get their own session"""
+        paths = [os.path.join(self._root, f"pool_{i}.jpg") for i in range(8)]
+        for path in paths:
+            shutil.copyfile(self._template, path)
+            self.addCleanup(Path(path).unlink, missing_ok=True)
+        
+        def write(i):
+            return apply_exif.run_exiftool([paths[i]], {'Caption-Abstract': f'pool {i}'},
+                                           dry_run=False, session=self.et)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertTrue(all(executor.map(write, range(len(paths)))))
+        
+        for i, path in enumerate(paths):
+            self.assertEqual(apply_exif.get_tag_value(path, 'Caption-Abstract', session=self.et), f'pool {i}')
+    
+    def test_batch_read_keywords(self):
+        """Test keywords for several files come back from one read"""
+        other = os.path.join(self._root, f"{self._testMethodName}_other.jpg")
+        shutil.copyfile(self._template, other)
+        self.addCleanup(Path(other).unlink, missing_ok=True)
+        apply_exif.run_exiftool([self.test_image], {'XMP-dc:Subject': ['first']},
+                                dry_run=False, session=self.et)
+        apply_exif.run_exiftool([other], {'XMP-dc:Subject': ['second', 'third']},
+                                dry_run=False, session=self.et)
+        
+        keywords = apply_exif.get_existing_keywords_batch([self.test_image, other], session=self.et)
+        
+        self.assertEqual(keywords[self.test_image]['XMP-dc:Subject'], ['first'])
+        self.assertEqual(keywords[other]['XMP-dc:Subject'], ['second', 'third'])
+    
+    def test_add_keyword_keeps_video_keywords_after_mdat(self):
+        """Test --add-keyword keeps existing keywords stored after a video's mdat"""
+        video = os.path.join(self._root, f"{self._testMethodName}.mp4")
+        Path(video).write_bytes(_MP4_MOOV_AFTER_MDAT)
+        self.addCleanup(Path(video).unlink, missing_ok=True)
+        apply_exif.run_exiftool([video], {'XMP-dc:Subject': ['existing']},
+                                dry_run=False, session=self.et)
+        
+        keywords = apply_exif.get_existing_keywords(video, session=self.et)
+        self.assertEqual(keywords['XMP-dc:Subject'], ['existing'])
+        
+        with patch('sys.argv', ['apply_exif.py', '--files', video, '--add-keyword', 'added']):
+            apply_exif.main()
+        
+        stdout, _ = self.et.execute(['-json', '-XMP-dc:Subject', video])
+        written = json.loads(stdout)[0].get('Subject', [])
+        written = [written] if isinstance(written, str) else written
+        self.assertCountEqual(written, ['added', 'existing'])
+    
+    def test_write_error_raises(self):
+        """Test exiftool errors surface as RuntimeError"""
+        missing = os.path.join(self._root, 'missing.jpg')
+        with self.assertRaises(RuntimeError):
+            apply_exif.run_exiftool([missing], {'Caption-Abstract': 'x'},
+                                    dry_run=False, session=self.et)
+
+
+
+class TestIntegrationLocationMetadata(_ExifIntegrationBase):
+    """Round-trip GPS and location tags through the persistent session"""
+    
+    EXPECTED_SUBJECTS = frozenset({'india', 'travel', 'vacation'})
+    
+    def test_verify_exif_written(self):
+        """Test verification reads back through the session"""
+        tags = {'GPSLatitude': 32.7157, 'GPSLatitudeRef': 'N'}
+        apply_exif.run_exiftool([self.test_image], tags, dry_run=False, session=self.et)
+        
+        self.assertTrue(apply_exif.verify_exif_written(self.test_image, tags, session=self.et))
+    
+    def test_gps_ref_round_trip(self):
+        """Test southern/eastern coordinates and location text survive a write
+        
+        The one test that reads GPS refs back from disk; the others assert
+        on the tags they pass to run_exiftool.
+        """
+        tags = apply_exif.create_exif_metadata_from_manual_params(
+            latitude=-33.8688,
+            longitude=151.2093,
+            altitude=58.0,
+            city="Sydney",
+            state="New South Wales",
+            country="Australia",
+            country_code="AU",
+            coverage="Sydney, Australia",
+            date_str="2026:01:01 12:00:00",
+            offset_str="+11:00"
+        )
+        apply_exif.run_exiftool([self.test_image], tags, dry_run=False, session=self.et)
+        
+        metadata = self._read_json('EXIF:GPSLatitude', 'EXIF:GPSLatitudeRef', 'EXIF:GPSLongitude',
+                                   'EXIF:GPSLongitudeRef', 'XMP-photoshop:City',
+                                   'EXIF:OffsetTimeOriginal', options=['-n'])
+        self.assertAlmostEqual(metadata['GPSLatitude'], 33.8688, places=4)
+        self.assertEqual(metadata['GPSLatitudeRef'], 'S')
+        self.assertAlmostEqual(metadata['GPSLongitude'], 151.2093, places=4)
+        self.assertEqual(metadata['GPSLongitudeRef'], 'E')
+        self.assertEqual(metadata['City'], 'Sydney')
+        self.assertEqual(metadata['OffsetTimeOriginal'], '+11:00')
+    
+    def test_combined_metadata(self):
+        """Test caption, date, GPS, city and keywords written together read back in one call"""
+        tags = {
+            'Caption-Abstract': 'Sunset at the beach',
+            'DateTimeOriginal': '2026:01:01 18:30:00',
+            'GPSLatitude': 28.6139,
+            'GPSLatitudeRef': 'N',
+            'XMP-photoshop:City': 'New Delhi',
+            'XMP-dc:Subject': sorted(self.EXPECTED_SUBJECTS),
+        }
+        apply_exif.run_exiftool([self.test_image], tags, dry_run=False, session=self.et)
+        
+        # One exiftool read for every assertion below
+        metadata = self._read_json('Caption-Abstract', 'EXIF:DateTimeOriginal',
+                                   'XMP-photoshop:City', 'XMP-dc:Subject')
+        self.assertEqual(metadata.get('Caption-Abstract'), 'Sunset at the beach')
+        self.assertEqual(metadata.get('DateTimeOriginal'), '2026:01:01 18:30:00')
+        self.assertEqual(metadata.get('City'), 'New Delhi')
+        self.assertEqual(frozenset(metadata.get('Subject', ())), self.EXPECTED_SUBJECTS)
+    
+    def test_update_existing_metadata(self):
+        """Test a second write replaces values and keeps untouched tags"""
+        apply_exif.run_exiftool([self.test_image], {
+            'XMP-photoshop:City': 'Fort Worth',
+            'XMP-photoshop:State': 'Texas',
+            'Caption-Abstract': 'Original caption',
+        }, dry_run=False, session=self.et)
+        apply_exif.run_exiftool([self.test_image], {
+            'XMP-photoshop:City': 'Dallas',
+            'Caption-Abstract': 'Updated caption',
+        }, dry_run=False, session=self.et)
+        
+        metadata = self._read_json('XMP-photoshop:City', 'XMP-photoshop:State', 'Caption-Abstract')
+        self.assertEqual(metadata.get('City'), 'Dallas')
+        self.assertEqual(metadata.get('State'), 'Texas')
+        self.assertEqual(metadata.get('Caption-Abstract'), 'Updated caption')
+
+    def test_different_timezone_offsets(self):
+        """Test five offset writes and their read-backs pipelined in one round trip"""
+        offsets = ['+05:30', '-05:00', '+00:00', '+13:00', '-09:30']
+        images = []
+        for i in range(len(offsets)):
+            image = os.path.join(self._root, f"offset_{i}.jpg")
+            shutil.copyfile(self._template, image)
+            self.addCleanup(Path(image).unlink, missing_ok=True)
+            images.append(image)
+
+        writes = [
+            apply_exif.build_exiftool_cmd([image], {
+                'DateTimeOriginal': '2026:01:01 12:00:00',
+                'OffsetTimeOriginal': offset,
+            }, dry_run=False)[1:]
+            for image, offset in zip(images, offsets)
+        ]
+        reads = [['-fast2', '-json', '-EXIF:OffsetTimeOriginal', image] for image in images]
+        responses = self.et.execute_many(writes + reads)
+
+        for stdout, _ in responses[:len(writes)]:
+            self.assertIn('1 image files updated', stdout)
+        read_back = [json.loads(stdout)[0]['OffsetTimeOriginal'] for stdout, _ in responses[len(writes):]]
+        self.assertEqual(read_back, offsets)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -78,6 +78,42 @@ class TestIndexMediaHelpers(unittest.TestCase):
         
         # Invalid regex (should handle gracefully)
         self.assertFalse(index_media.matches_include_pattern("/path/to/file.jpg", [r"[invalid("], literal=False))
+    
+    def test_normalize_exif_data_tag_aliases(self):
+        """Test each field takes its first non-empty alias"""
+        exif = {
+            'EXIF:DateTimeOriginal': '',
+            'EXIF:CreateDate': '2024:01:15 12:00:00',
+            'IPTC:City': 'Fort Worth',
+            'XMP:City': 'Dallas',
+            'XMP-dc:Subject': ['beach', 2024],
+            'IPTC:Keywords': ['ignored'],
+            'Composite:GPSLatitude': 32.7555,
+        }
+        
+        normalized = index_media.normalize_exif_data(exif)
+        
+        self.assertEqual(normalized['date_taken'], '2024:01:15 12:00:00')
+        self.assertEqual(normalized['city'], 'Fort Worth')
+        self.assertEqual(normalized['keywords'], 'beach, 2024')
+        self.assertEqual(normalized['latitude'], 32.7555)
+        self.assertIsNone(normalized['caption'])
+        self.assertIsNone(index_media._resolve({'XMP:Coverage': ''}, 'coverage'))
+        self.assertEqual(index_media._resolve({'Coverage': ''}, 'coverage'), '')
+    
+    @patch('subprocess.run')
+    def test_get_exif_data_parses_bytes(self, mock_run):
+        """Test exiftool output is parsed from raw bytes"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='[{"EXIF:Model": "Café Cam", "File:ImageWidth": 640}]'.encode('utf-8')
+        )
+        
+        exif = index_media.get_exif_data("/path/to/photo.jpg")
+        
+        self.assertNotIn('text', mock_run.call_args.kwargs)
+        self.assertEqual(exif['EXIF:Model'], "Café Cam")
+        self.assertEqual(exif['File:ImageWidth'], 640)
 
 
 class TestIndexMediaDatabase(unittest.TestCase):
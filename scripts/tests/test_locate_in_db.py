@@ -5,8 +5,8 @@ Integration tests for locate_in_db.py
 Tests the file location functionality including:
 - Finding files by hash
 - Grouping duplicates
-- Metadata display
-- JSON output
+- Metadata lookup
+- JSON, text and summary output
 - Error handling
 """
 
@@ -17,201 +17,181 @@ import sys
 import sqlite3
 import shutil
 import json
+import hashlib
+from contextlib import redirect_stdout, redirect_stderr
 from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from locate_in_db import (
-    locate_files,
-    format_output,
-    format_json_output
-)
+import locate_in_db
+from locate_in_db import find_by_hash, get_file_metadata
 from media_utils import create_database_schema, calculate_file_hash
 
 
+# Fixture contents; test1 and test2 are duplicates
+PAYLOAD1 = b'Test image 1 content'
+PAYLOAD3 = b'Test image 3 unique content'
+
+# Hashed once at import, matching calculate_file_hash (SHA256)
+HASH1 = hashlib.sha256(PAYLOAD1).hexdigest()
+HASH3 = hashlib.sha256(PAYLOAD3).hexdigest()
+
+
+def _write_file(path, payload):
+    """Write bytes with raw os calls, skipping the buffered file object"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
+
 class TestLocateInDb(unittest.TestCase):
     """Test suite for locate_in_db.py"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for the whole class"""
+        cls.class_tmp = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove every test's fixtures at once"""
+        shutil.rmtree(cls.class_tmp, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures"""
-        # Create temporary directories
-        self.test_dir = tempfile.mkdtemp()
-        self.db_path = os.path.join(self.test_dir, 'test.db')
+        # Per-test subdirectory of the class directory
+        self.test_dir = os.path.join(self.class_tmp, self._testMethodName)
+        os.mkdir(self.test_dir)
         
-        # Create test database
+        # On disk, since main() opens the database by path
+        self.db_path = os.path.join(self.test_dir, 'test.db')
         self.conn = sqlite3.connect(self.db_path)
-        create_database_schema(self.conn)
+        # Throwaway database: WAL skips the per-commit sync of the main file
+        create_database_schema(self.conn, wal=True)
         
         # Create test files
         self.test_file1 = os.path.join(self.test_dir, 'test1.jpg')
         self.test_file2 = os.path.join(self.test_dir, 'test2.jpg')
         self.test_file3 = os.path.join(self.test_dir, 'test3.jpg')
         
-        with open(self.test_file1, 'wb') as f:
-            f.write(b'Test image 1 content')
-        
-        with open(self.test_file2, 'wb') as f:
-            f.write(b'Test image 1 content')  # Same content as file1
-        
-        with open(self.test_file3, 'wb') as f:
-            f.write(b'Test image 3 unique content')
-        
-        # Calculate hashes
-        self.hash1 = calculate_file_hash(self.test_file1)
-        self.hash2 = calculate_file_hash(self.test_file2)
-        self.hash3 = calculate_file_hash(self.test_file3)
-        
-        # Add files to database
-        cursor = self.conn.cursor()
-        
-        # File 1 and 2 have same hash (duplicates)
-        cursor.execute("""
-            INSERT INTO files (volume, fullpath, name, modified_date, size, file_hash, indexed_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, ('Volume1', '/path/to/test1.jpg', 'test1.jpg', 
-              datetime.now().isoformat(), 20, self.hash1, datetime.now().isoformat()))
-        
-        cursor.execute("""
-            INSERT INTO files (volume, fullpath, name, modified_date, size, file_hash, indexed_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, ('Volume2', '/path/to/test2.jpg', 'test2.jpg', 
-              datetime.now().isoformat(), 20, self.hash2, datetime.now().isoformat()))
-        
-        # File 3 is unique
-        cursor.execute("""
-            INSERT INTO files (volume, fullpath, name, modified_date, size, file_hash, indexed_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, ('Volume1', '/path/to/test3.jpg', 'test3.jpg', 
-              datetime.now().isoformat(), 28, self.hash3, datetime.now().isoformat()))
-        
+        _write_file(self.test_file1, PAYLOAD1)
+        os.link(self.test_file1, self.test_file2)  # Same content as file1
+        _write_file(self.test_file3, PAYLOAD3)
+        
+        # Hashes of the known contents
+        self.hash1 = HASH1
+        self.hash2 = HASH1
+        self.hash3 = HASH3
+        
+        # Add files to database: file 1 and 2 have same hash (duplicates),
+        # file 3 is unique
+        now = datetime.now().isoformat()
+        rows = [
+            ('Volume1', '/path/to/test1.jpg', 'test1.jpg', now, 20, 'image/jpeg', self.hash1, now),
+            ('Volume2', '/path/to/test2.jpg', 'test2.jpg', now, 20, 'image/jpeg', self.hash2, now),
+            ('Volume1', '/path/to/test3.jpg', 'test3.jpg', now, 28, 'image/jpeg', self.hash3, now),
+        ]
+        self.conn.executemany("""
+            INSERT INTO files (volume, fullpath, name, modified_date, size, mime_type, file_hash, indexed_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
         self.conn.commit()
     
     def tearDown(self):
         """Clean up test fixtures"""
         self.conn.close()
-        shutil.rmtree(self.test_dir)
     
-    def test_locate_single_file_found(self):
-        """Test locating a single file that exists in database"""
-        results = locate_files(
-            files=[self.test_file1],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        self.assertEqual(len(results), 1)
-        self.assertIn(self.test_file1, results)
-        
-        file_info = results[self.test_file1]
-        self.assertEqual(file_info['status'], 'found')
-        self.assertGreater(len(file_info['locations']), 0)
+    def run_main(self, *args):
+        """Run locate_in_db.main() with the given arguments and return its stdout"""
+        argv = ['locate_in_db.py', '--db-path', self.db_path, *args]
+        stdout = StringIO()
+        with patch.object(sys, 'argv', argv), redirect_stdout(stdout), redirect_stderr(StringIO()):
+            locate_in_db.main()
+        return stdout.getvalue()
     
-    def test_locate_file_not_found(self):
-        """Test locating a file that doesn't exist in database"""
-        nonexistent = os.path.join(self.test_dir, 'nonexistent.jpg')
-        with open(nonexistent, 'wb') as f:
-            f.write(b'Nonexistent file content')
-        
-        results = locate_files(
-            files=[nonexistent],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        self.assertEqual(len(results), 1)
-        self.assertIn(nonexistent, results)
-        
-        file_info = results[nonexistent]
-        self.assertEqual(file_info['status'], 'not_found')
-        self.assertEqual(len(file_info['locations']), 0)
+    def test_find_by_hash_single_match(self):
+        """Test a hash stored once returns that one row"""
+        matches = find_by_hash(self.conn, self.hash3)
+        
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0]['fullpath'], '/path/to/test3.jpg')
+        self.assertEqual(matches[0]['volume'], 'Volume1')
+        self.assertEqual(matches[0]['size'], 28)
     
-    def test_locate_duplicate_files(self):
-        """Test locating files that have duplicates"""
-        results = locate_files(
-            files=[self.test_file1],
-            db_path=self.db_path,
-            metadata=False
-        )
+    def test_find_by_hash_duplicates(self):
+        """Test a hash stored twice returns both locations"""
+        matches = find_by_hash(self.conn, self.hash1)
         
-        file_info = results[self.test_file1]
-        
-        # Should find 2 locations (test1.jpg and test2.jpg have same hash)
-        self.assertEqual(len(file_info['locations']), 2)
-        self.assertTrue(file_info['is_duplicate'])
+        # test1.jpg and test2.jpg have the same hash
+        self.assertEqual(sorted(m['name'] for m in matches), ['test1.jpg', 'test2.jpg'])
     
-    def test_locate_unique_file(self):
-        """Test locating a file with no duplicates"""
-        results = locate_files(
-            files=[self.test_file3],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        file_info = results[self.test_file3]
-        
-        # Should find 1 location
-        self.assertEqual(len(file_info['locations']), 1)
-        self.assertFalse(file_info['is_duplicate'])
-    
-    def test_locate_multiple_files(self):
-        """Test locating multiple files at once"""
-        results = locate_files(
-            files=[self.test_file1, self.test_file3],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        self.assertEqual(len(results), 2)
-        self.assertIn(self.test_file1, results)
-        self.assertIn(self.test_file3, results)
+    def test_find_by_hash_not_found(self):
+        """Test an unknown hash returns no rows"""
+        unknown = hashlib.sha256(b'Nonexistent file content').hexdigest()
+        self.assertEqual(find_by_hash(self.conn, unknown), [])
     
-    def test_metadata_option(self):
-        """Test metadata display option"""
-        results = locate_files(
-            files=[self.test_file1],
-            db_path=self.db_path,
-            metadata=True
-        )
-        
-        file_info = results[self.test_file1]
+    def test_get_file_metadata(self):
+        """Test image metadata is read for image rows only"""
+        file_id = find_by_hash(self.conn, self.hash3)[0]['id']
+        self.conn.execute("""
+            INSERT INTO image_metadata (file_id, width, height, camera_make, city)
+            VALUES (?, ?, ?, ?, ?)
+        """, (file_id, 640, 480, 'Canon', 'Paris'))
+        self.conn.commit()
         
-        # With metadata, locations should include detailed info
-        self.assertGreater(len(file_info['locations']), 0)
+        metadata = get_file_metadata(self.conn, file_id, 'image/jpeg')
+        self.assertEqual(metadata['type'], 'image')
+        self.assertEqual((metadata['width'], metadata['height']), (640, 480))
+        self.assertEqual(metadata['camera_make'], 'Canon')
+        self.assertEqual(metadata['city'], 'Paris')
         
-        location = file_info['locations'][0]
-        self.assertIn('volume', location)
-        self.assertIn('size', location)
-        self.assertIn('path', location)
+        self.assertIsNone(get_file_metadata(self.conn, file_id, 'video/mp4'))
+        self.assertIsNone(get_file_metadata(self.conn, file_id, None))
     
-    def test_format_output_text(self):
-        """Test text output formatting"""
-        results = locate_files(
-            files=[self.test_file1, self.test_file3],
-            db_path=self.db_path,
-            metadata=False
-        )
+    def test_main_text_output_groups_results(self):
+        """Test text output lists files by not found, unique and duplicate"""
+        new_file = os.path.join(self.test_dir, 'new.jpg')
+        _write_file(new_file, b'New content')
         
-        output = format_output(results, metadata=False)
+        output = self.run_main('--file', self.test_file1, '--file', self.test_file3,
+                               '--file', new_file)
         
-        self.assertIsInstance(output, str)
         self.assertIn('test1.jpg', output)
         self.assertIn('test3.jpg', output)
+        self.assertIn('new.jpg', output)
+        self.assertIn('Total: 1 not found, 1 unique, 1 with duplicates', output)
     
-    def test_format_output_json(self):
-        """Test JSON output formatting"""
-        results = locate_files(
-            files=[self.test_file1],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        json_output = format_json_output(results)
+    def test_main_json_output(self):
+        """Test JSON output reports the hash and every match"""
+        output = self.run_main('--file', self.test_file1, '--json')
+        
+        parsed = json.loads(output)
+        self.assertEqual(parsed['query_file'], self.test_file1)
+        self.assertEqual(parsed['hash'], self.hash1)
+        self.assertEqual(parsed['match_count'], 2)
+        # The indexed paths are not on this machine
+        self.assertFalse(any(m['exists'] for m in parsed['matches']))
+    
+    def test_main_summary(self):
+        """Test summary mode prints counts only"""
+        output = self.run_main('--file', self.test_file1, '--file', self.test_file3, '--summary')
+        
+        self.assertIn('Files queried: 2', output)
+        self.assertIn('Files with matches: 2', output)
+        self.assertIn('Total matches found: 3', output)
+        self.assertNotIn('RESULTS SUMMARY', output)
+    
+    def test_main_skips_missing_query_file(self):
+        """Test a query file that does not exist is skipped"""
+        missing = os.path.join(self.test_dir, 'missing.jpg')
+        output = self.run_main('--file', missing, '--file', self.test_file3, '--summary')
         
-        # Verify it's valid JSON
-        parsed = json.loads(json_output)
-        self.assertIsInstance(parsed, dict)
-        self.assertIn('results', parsed)
+        self.assertIn('Files queried: 1', output)
     
     def test_hash_calculation_consistency(self):
         """Test that hash calculation is consistent"""
@@ -219,53 +199,22 @@ class TestLocateInDb(unittest.TestCase):
         hash2 = calculate_file_hash(self.test_file1)
         
         self.assertEqual(hash1, hash2)
+        self.assertEqual(hash1, HASH1)
     
     def test_nonexistent_database(self):
-        """Test handling of non-existent database"""
-        nonexistent_db = os.path.join(self.test_dir, 'nonexistent.db')
+        """Test a missing database exits with an error"""
+        self.db_path = os.path.join(self.test_dir, 'nonexistent.db')
         
-        # Should handle gracefully
-        try:
-            results = locate_files(
-                files=[self.test_file1],
-                db_path=nonexistent_db,
-                metadata=False
-            )
-            # If it doesn't raise an exception, check results
-            self.assertIsNotNone(results)
-        except Exception as e:
-            # If it raises an exception, it should be a reasonable one
-            self.assertIn('database', str(e).lower())
+        with self.assertRaises(SystemExit) as cm:
+            self.run_main('--file', self.test_file1)
+        self.assertEqual(cm.exception.code, 1)
+        self.assertFalse(os.path.exists(self.db_path))
     
     def test_empty_file_list(self):
-        """Test handling of empty file list"""
-        results = locate_files(
-            files=[],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        self.assertEqual(len(results), 0)
-    
-    def test_file_grouping(self):
-        """Test that files are properly grouped by status"""
-        # Create a file not in database
-        nonexistent = os.path.join(self.test_dir, 'new.jpg')
-        with open(nonexistent, 'wb') as f:
-            f.write(b'New content')
-        
-        results = locate_files(
-            files=[self.test_file1, self.test_file3, nonexistent],
-            db_path=self.db_path,
-            metadata=False
-        )
-        
-        # Count by status
-        found_count = sum(1 for r in results.values() if r['status'] == 'found')
-        not_found_count = sum(1 for r in results.values() if r['status'] == 'not_found')
-        
-        self.assertEqual(found_count, 2)  # test1 and test3
-        self.assertEqual(not_found_count, 1)  # nonexistent
+        """Test that at least one --file is required"""
+        with self.assertRaises(SystemExit) as cm:
+            self.run_main()
+        self.assertEqual(cm.exception.code, 2)
 
 
 if __name__ == '__main__':
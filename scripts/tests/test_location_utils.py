@@ -12,13 +12,16 @@ Tests the location utility functions including:
 import unittest
 import sys
 import os
+from unittest.mock import patch, MagicMock
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import location_utils
 from location_utils import (
     geocode_place,
     validate_coordinates,
+    validate_coordinates_batch,
     format_address,
     parse_coordinates
 )
@@ -53,6 +56,29 @@ class TestLocationUtils(unittest.TestCase):
         self.assertFalse(validate_coordinates(0, None))
         self.assertFalse(validate_coordinates(None, None))
     
+    def test_validate_coordinates_not_finite(self):
+        """Test NaN and infinity are rejected"""
+        self.assertFalse(validate_coordinates(float('nan'), 0))
+        self.assertFalse(validate_coordinates(0, float('nan')))
+        self.assertFalse(validate_coordinates(float('inf'), 0))
+        self.assertFalse(validate_coordinates(0, float('-inf')))
+    
+    def test_validate_coordinates_batch(self):
+        """Test the batch validator agrees with the scalar one"""
+        lats = [40.7128, 91, None, float('nan'), -90, 0]
+        lons = [-74.0060, 0, 0, 0, -180, 180.5]
+        expected = [validate_coordinates(lat, lon) for lat, lon in zip(lats, lons)]
+        self.assertEqual(expected, [True, False, False, False, True, False])
+        
+        result = validate_coordinates_batch(lats, lons)
+        self.assertEqual([bool(ok) for ok in result], expected)
+        if location_utils.NUMPY_AVAILABLE:
+            self.assertEqual(result.dtype, bool)
+            self.assertEqual(result.shape, (len(lats),))
+        
+        with patch('location_utils.NUMPY_AVAILABLE', False):
+            self.assertEqual(validate_coordinates_batch(lats, lons), expected)
+    
     def test_validate_coordinates_string(self):
         """Test validation with string values"""
         # Should handle string conversion
@@ -94,6 +120,24 @@ class TestLocationUtils(unittest.TestCase):
         with self.assertRaises(Exception):
             parse_coordinates("40.7128")
     
+    def test_parse_coordinates_whitespace_separated(self):
+        """Test a comma is optional between values"""
+        self.assertEqual(parse_coordinates(" 40.7128 -74.0060 "), (40.7128, -74.006))
+        self.assertEqual(parse_coordinates("40.7128 ,-74.0060, .5"), (40.7128, -74.006, 0.5))
+    
+    def test_parse_coordinates_rejects_non_decimal_forms(self):
+        """Test hemisphere letters, DMS, exponents and extra values are rejected"""
+        for text in ["40.7128 N, 74.0060 W",
+                     "40°42'46\"N 74°0'22\"W",
+                     "40°42'46\"N",
+                     "1e5, 2",
+                     "40.7128, -74.0060, 10, 20",
+                     "40.7128,, -74.0060",
+                     "40.7128; -74.0060"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_coordinates(text)
+    
     def test_format_address_full(self):
         """Test formatting full address"""
         address = format_address(
@@ -207,6 +251,26 @@ class TestLocationUtils(unittest.TestCase):
         self.assertIsInstance(address, str)
         self.assertIn("São Paulo", address)
     
+    @patch('location_utils.Nominatim')
+    def test_geocode_place_memoized(self, mock_nominatim):
+        """Test repeated place names reuse the first geocoder result"""
+        geocode_place.cache_clear()
+        self.addCleanup(geocode_place.cache_clear)
+        location = MagicMock(latitude=51.5074, longitude=-0.1278)
+        mock_nominatim.return_value.geocode.return_value = location
+        
+        self.assertIs(geocode_place("London, UK"), location)
+        self.assertIs(geocode_place("London, UK"), location)
+        self.assertEqual(mock_nominatim.return_value.geocode.call_count, 1)
+        
+        # Failures are not cached
+        mock_nominatim.return_value.geocode.return_value = None
+        with patch('location_utils.time.sleep'):
+            with self.assertRaises(ValueError):
+                geocode_place("Nowhere", max_retries=1)
+        mock_nominatim.return_value.geocode.return_value = location
+        self.assertIs(geocode_place("Nowhere", max_retries=1), location)
+    
     def test_geocode_caching(self):
         """Test that geocoding results can be cached"""
         try:
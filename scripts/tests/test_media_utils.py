@@ -11,11 +11,13 @@ Tests the shared utility functions including:
 """
 
 import unittest
+from unittest.mock import patch
 import tempfile
 import os
 import sys
 import sqlite3
 import shutil
+import hashlib
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,6 +25,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from media_utils import (
     create_database_schema,
     calculate_file_hash,
+    calculate_file_hashes,
     get_mime_type,
     is_image_file,
     is_video_file
@@ -42,10 +45,23 @@ class TestMediaUtils(unittest.TestCase):
         self.test_file = os.path.join(self.test_dir, 'test.txt')
         with open(self.test_file, 'wb') as f:
             f.write(b'Test content for hashing')
+        
+        # Files to unlink in tearDown (tests append any they create)
+        self._to_cleanup = [self.test_file] + [
+            self.db_path + suffix for suffix in ('', '-wal', '-shm', '-journal')]
     
     def tearDown(self):
         """Clean up test fixtures"""
-        shutil.rmtree(self.test_dir)
+        for path in self._to_cleanup:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        try:
+            os.rmdir(self.test_dir)
+        except OSError:
+            # A test left an untracked file behind
+            shutil.rmtree(self.test_dir)
     
     def test_create_database_schema(self):
         """Test database schema creation"""
@@ -75,6 +91,28 @@ class TestMediaUtils(unittest.TestCase):
         
         conn.close()
     
+    def test_database_schema_connection_settings(self):
+        """Test schema creation tunes the connection but keeps the journal mode"""
+        conn = sqlite3.connect(self.db_path)
+        create_database_schema(conn)
+        
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'delete')
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 2)  # FULL
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -32000)
+        
+        conn.close()
+    
+    def test_database_schema_wal(self):
+        """Test WAL and synchronous=NORMAL are applied only on request"""
+        conn = sqlite3.connect(self.db_path)
+        create_database_schema(conn, wal=True)
+        
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        
+        conn.close()
+    
     def test_database_schema_indexes(self):
         """Test that database indexes are created"""
         conn = sqlite3.connect(self.db_path)
@@ -92,6 +130,12 @@ class TestMediaUtils(unittest.TestCase):
         
         # Should have indexes on volume, extension, hash, etc.
         self.assertGreater(len(indexes), 0)
+        self.assertIn('idx_files_hash_path', indexes)
+        
+        # Duplicate lookups by hash are answered from the index alone
+        plan = ' '.join(str(row) for row in cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT fullpath FROM files WHERE file_hash = ?", ('x',)))
+        self.assertIn('COVERING INDEX idx_files_hash_path', plan)
         
         conn.close()
     
@@ -113,6 +157,7 @@ class TestMediaUtils(unittest.TestCase):
     def test_calculate_file_hash_different_files(self):
         """Test that different files produce different hashes"""
         test_file2 = os.path.join(self.test_dir, 'test2.txt')
+        self._to_cleanup.append(test_file2)
         with open(test_file2, 'wb') as f:
             f.write(b'Different content')
         
@@ -133,17 +178,19 @@ class TestMediaUtils(unittest.TestCase):
     def test_calculate_file_hash_empty_file(self):
         """Test hash calculation for empty file"""
         empty_file = os.path.join(self.test_dir, 'empty.txt')
+        self._to_cleanup.append(empty_file)
         with open(empty_file, 'wb') as f:
             pass  # Create empty file
         
         file_hash = calculate_file_hash(empty_file)
         
         self.assertIsNotNone(file_hash)
-        self.assertEqual(len(file_hash), 64)
+        self.assertEqual(file_hash, hashlib.sha256(b'').hexdigest())
     
     def test_calculate_file_hash_large_file(self):
         """Test hash calculation for large file"""
         large_file = os.path.join(self.test_dir, 'large.bin')
+        self._to_cleanup.append(large_file)
         
         # Create a 1MB file
         with open(large_file, 'wb') as f:
@@ -152,7 +199,55 @@ class TestMediaUtils(unittest.TestCase):
         file_hash = calculate_file_hash(large_file)
         
         self.assertIsNotNone(file_hash)
-        self.assertEqual(len(file_hash), 64)
+        self.assertEqual(file_hash, hashlib.sha256(b'X' * (1024 * 1024)).hexdigest())
+    
+    def test_calculate_file_hash_unmappable(self):
+        """Test files that cannot be memory-mapped hash the same way"""
+        with patch('media_utils.mmap.mmap', side_effect=OSError("no mmap")):
+            file_hash = calculate_file_hash(self.test_file)
+        
+        self.assertEqual(file_hash, hashlib.sha256(b'Test content for hashing').hexdigest())
+    
+    def test_calculate_file_hash_streaming(self):
+        """Test the pre-3.11 read loop, with a buffer smaller than the file"""
+        with patch('media_utils.mmap.mmap', side_effect=OSError("no mmap")), \
+                patch.object(hashlib, 'file_digest', None, create=True):
+            file_hash = calculate_file_hash(self.test_file, chunk_size=5)
+        
+        self.assertEqual(file_hash, hashlib.sha256(b'Test content for hashing').hexdigest())
+    
+    def test_calculate_file_hash_without_usedforsecurity(self):
+        """Test Pythons whose hashlib lacks usedforsecurity (3.8) still hash"""
+        expected = hashlib.sha256(b'Test content for hashing').hexdigest()
+        sha256 = hashlib.sha256
+        
+        def sha256_38(*args, **kwargs):
+            if kwargs:
+                raise TypeError("openssl_sha256() takes no keyword arguments")
+            return sha256(*args)
+        
+        with patch('media_utils.hashlib.sha256', side_effect=sha256_38):
+            self.assertEqual(calculate_file_hash(self.test_file), expected)
+    
+    def test_calculate_file_hashes_batch(self):
+        """Test batch hashing matches per-file hashing"""
+        test_file2 = os.path.join(self.test_dir, 'test2.txt')
+        self._to_cleanup.append(test_file2)
+        with open(test_file2, 'wb') as f:
+            f.write(b'Different content')
+        nonexistent = os.path.join(self.test_dir, 'nonexistent.txt')
+        
+        expected = {
+            self.test_file: calculate_file_hash(self.test_file),
+            test_file2: calculate_file_hash(test_file2),
+            nonexistent: None,
+        }
+        
+        for max_workers in (None, 1, 4):
+            with self.subTest(max_workers=max_workers):
+                hashes = calculate_file_hashes(
+                    [self.test_file, test_file2, nonexistent], max_workers=max_workers)
+                self.assertEqual(hashes, expected)
     
     def test_get_mime_type_jpg(self):
         """Test MIME type detection for JPEG"""
@@ -174,6 +269,11 @@ class TestMediaUtils(unittest.TestCase):
         mime_type = get_mime_type('test.xyz')
         self.assertIsNotNone(mime_type)
     
+    def test_get_mime_type_case_insensitive(self):
+        """Test MIME type detection ignores extension case and directories"""
+        self.assertEqual(get_mime_type('/photos/IMG_0001.JPG'), 'image/jpeg')
+        self.assertEqual(get_mime_type('/photos.d/README'), 'application/octet-stream')
+    
     def test_is_image_file_jpeg(self):
         """Test image detection for JPEG"""
         self.assertTrue(is_image_file('image/jpeg', '.jpg'))
@@ -194,6 +294,10 @@ class TestMediaUtils(unittest.TestCase):
         """Test image detection for ARW (Sony RAW)"""
         self.assertTrue(is_image_file('application/octet-stream', '.arw'))
     
+    def test_is_image_file_raw_uppercase(self):
+        """Test RAW detection ignores extension case"""
+        self.assertTrue(is_image_file('application/octet-stream', '.CR3'))
+    
     def test_is_image_file_not_image(self):
         """Test image detection for non-image file"""
         self.assertFalse(is_image_file('text/plain', '.txt'))
@@ -248,12 +352,9 @@ class TestMediaUtils(unittest.TestCase):
             '.r3d', '.x3f', '.iiq'
         ]
         
-        for ext in raw_formats:
-            with self.subTest(ext=ext):
-                self.assertTrue(
-                    is_image_file('application/octet-stream', ext),
-                    f"Failed to detect {ext} as image"
-                )
+        missing = [ext for ext in raw_formats
+                   if not is_image_file('application/octet-stream', ext)]
+        self.assertEqual(missing, [], f"Failed to detect {missing} as image")
     
     def test_mime_type_case_insensitive(self):
         """Test that MIME type detection is case insensitive"""
@@ -1,33 +1,47 @@
 #!/usr/bin/env python3
 """
-Integration tests for show_exif.py
+Tests for show_exif.py
 
 Tests the EXIF display functionality including:
-- Reading EXIF data
+- Running exiftool and caching its output
 - Different display modes
-- GPS data extraction
-- Thumbnail extraction
+- GPS and keyword fallbacks
+- JSON output
 - Error handling
+
+exiftool itself is mocked, so these tests run without it installed.
 """
 
 import unittest
 import tempfile
+import io
+import json
 import os
 import sys
 import shutil
-from PIL import Image
-from PIL.ExifTags import TAGS
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+from unittest.mock import patch, MagicMock
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import show_exif
 from show_exif import (
-    read_exif_data,
-    format_exif_output,
-    extract_thumbnail
+    run_exiftool,
+    show_common_tags,
+    show_gps_tags,
+    show_specific_tags,
+    show_keywords,
+    show_json
 )
 
 
+# Any bytes do: exiftool is mocked, only the file's stat signature matters
+_JPEG_STUB = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\xff\xd9'
+
+
 class TestShowExif(unittest.TestCase):
     """Test suite for show_exif.py"""
     
@@ -36,171 +50,292 @@ class TestShowExif(unittest.TestCase):
         # Create temporary directory
         self.test_dir = tempfile.mkdtemp()
         
-        # Create test image with EXIF data
+        # Create test image
         self.test_image = os.path.join(self.test_dir, 'test.jpg')
-        self._create_test_image_with_exif()
+        with open(self.test_image, 'wb') as f:
+            f.write(_JPEG_STUB)
+        
+        # Spawn exiftool per call (mocked below) instead of a shared session
+        session_patcher = patch('show_exif._get_session', return_value=None)
+        session_patcher.start()
+        self.addCleanup(session_patcher.stop)
         
-        # Create test image without EXIF
-        self.test_image_no_exif = os.path.join(self.test_dir, 'no_exif.jpg')
-        img = Image.new('RGB', (100, 100), color='red')
-        img.save(self.test_image_no_exif)
+        run_patcher = patch('show_exif.subprocess.run')
+        self.mock_run = run_patcher.start()
+        self.addCleanup(run_patcher.stop)
+        self.set_output('')
+        
+        show_exif._run_exiftool_cached.cache_clear()
+        self.addCleanup(show_exif._run_exiftool_cached.cache_clear)
     
     def tearDown(self):
         """Clean up test fixtures"""
         shutil.rmtree(self.test_dir)
     
-    def _create_test_image_with_exif(self):
-        """Create a test image with EXIF data"""
-        img = Image.new('RGB', (100, 100), color='blue')
-        
-        # Create EXIF data
-        exif_dict = {
-            'Make': 'Test Camera',
-            'Model': 'Test Model',
-            'DateTime': '2024:01:15 12:00:00',
-            'Software': 'Test Software'
-        }
-        
-        # Note: PIL doesn't easily allow setting EXIF, so we'll save without it
-        # The actual tests will use exiftool which can read real EXIF
-        img.save(self.test_image, 'JPEG', quality=95)
-    
-    def test_read_exif_from_file(self):
-        """Test reading EXIF data from a file"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='common')
-            self.assertIsNotNone(exif_data)
-            self.assertIsInstance(exif_data, dict)
-        except Exception as e:
-            # If exiftool is not available, skip
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_read_exif_no_exif_data(self):
-        """Test reading EXIF from file without EXIF data"""
-        try:
-            exif_data = read_exif_data(self.test_image_no_exif, mode='common')
-            # Should return empty dict or minimal data
-            self.assertIsInstance(exif_data, dict)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_read_exif_nonexistent_file(self):
-        """Test reading EXIF from non-existent file"""
+    def set_output(self, stdout):
+        """Make the mocked exiftool print ``stdout``"""
+        self.mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=stdout, stderr='')
+    
+    def exiftool_args(self):
+        """Arguments of the last exiftool call"""
+        return self.mock_run.call_args[0][0]
+    
+    def capture(self, func, *args, **kwargs):
+        """Call ``func`` and return what it printed"""
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            func(*args, **kwargs)
+        return stdout.getvalue()
+    
+    def test_run_exiftool_passes_options_then_files(self):
+        """Test the command line is exiftool, options, files"""
+        self.set_output('Make : Canon\n')
+        
+        output = run_exiftool([self.test_image], ['-Make'])
+        
+        self.assertEqual(output, 'Make : Canon\n')
+        self.assertEqual(self.exiftool_args(), ['exiftool', '-Make', self.test_image])
+    
+    def test_run_exiftool_caches_unchanged_file(self):
+        """Test a repeated read of an unchanged file does not rerun exiftool"""
+        run_exiftool([self.test_image], ['-Make'])
+        run_exiftool([self.test_image], ['-Make'])
+        self.assertEqual(self.mock_run.call_count, 1)
+        
+        # Different options are a different read
+        run_exiftool([self.test_image], ['-Model'])
+        self.assertEqual(self.mock_run.call_count, 2)
+    
+    def test_run_exiftool_rereads_modified_file(self):
+        """Test a file whose size or mtime changed is read again"""
+        run_exiftool([self.test_image], ['-Make'])
+        with open(self.test_image, 'ab') as f:
+            f.write(b'more')
+        run_exiftool([self.test_image], ['-Make'])
+        
+        self.assertEqual(self.mock_run.call_count, 2)
+    
+    def test_run_exiftool_missing_file_not_cached(self):
+        """Test a file that cannot be stat'ed goes straight to exiftool"""
         nonexistent = os.path.join(self.test_dir, 'nonexistent.jpg')
+        run_exiftool([nonexistent], ['-Make'])
+        run_exiftool([nonexistent], ['-Make'])
         
-        with self.assertRaises(Exception):
-            read_exif_data(nonexistent, mode='common')
+        self.assertEqual(self.mock_run.call_count, 2)
+    
+    def test_run_exiftool_error_exits(self):
+        """Test an exiftool failure is reported and exits"""
+        self.mock_run.side_effect = subprocess.CalledProcessError(
+            1, ['exiftool'], output='', stderr='Error: File not found')
+        
+        stderr = StringIO()
+        with redirect_stderr(stderr), self.assertRaises(SystemExit) as cm:
+            run_exiftool([self.test_image], ['-Make'])
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn('Error: File not found', stderr.getvalue())
+    
+    def test_run_exiftool_not_installed_exits(self):
+        """Test a missing exiftool binary is reported and exits"""
+        self.mock_run.side_effect = FileNotFoundError('exiftool')
+        
+        stderr = StringIO()
+        with redirect_stderr(stderr), self.assertRaises(SystemExit):
+            run_exiftool([self.test_image], ['-Make'])
+        self.assertIn('exiftool not found', stderr.getvalue())
     
     def test_display_mode_common(self):
-        """Test common EXIF display mode"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='common')
-            output = format_exif_output(exif_data, mode='common')
-            
-            self.assertIsInstance(output, str)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_display_mode_all(self):
-        """Test all EXIF display mode"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='all')
-            output = format_exif_output(exif_data, mode='all')
-            
-            self.assertIsInstance(output, str)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_display_mode_gps(self):
-        """Test GPS EXIF display mode"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='gps')
-            output = format_exif_output(exif_data, mode='gps')
-            
-            self.assertIsInstance(output, str)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_display_mode_grouped(self):
-        """Test grouped EXIF display mode"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='grouped')
-            output = format_exif_output(exif_data, mode='grouped')
-            
-            self.assertIsInstance(output, str)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_extract_thumbnail(self):
-        """Test thumbnail extraction"""
-        try:
-            thumbnail = extract_thumbnail(self.test_image)
-            
-            # May or may not have thumbnail
-            if thumbnail is not None:
-                self.assertIsInstance(thumbnail, bytes)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_multiple_files(self):
-        """Test processing multiple files"""
-        # Create another test file
-        test_image2 = os.path.join(self.test_dir, 'test2.jpg')
-        img = Image.new('RGB', (100, 100), color='green')
-        img.save(test_image2)
-        
-        try:
-            for file in [self.test_image, test_image2]:
-                exif_data = read_exif_data(file, mode='common')
-                self.assertIsInstance(exif_data, dict)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
-    
-    def test_invalid_file_type(self):
-        """Test handling of invalid file type"""
-        # Create a text file
-        text_file = os.path.join(self.test_dir, 'test.txt')
-        with open(text_file, 'w') as f:
-            f.write('Not an image')
-        
-        # Should handle gracefully
-        try:
-            exif_data = read_exif_data(text_file, mode='common')
-            # May return empty dict or raise exception
-            self.assertIsInstance(exif_data, dict)
-        except Exception as e:
-            # Expected to fail for non-image files
-            self.assertIsInstance(e, Exception)
-    
-    def test_format_output_consistency(self):
-        """Test that output formatting is consistent"""
-        try:
-            exif_data = read_exif_data(self.test_image, mode='common')
-            
-            output1 = format_exif_output(exif_data, mode='common')
-            output2 = format_exif_output(exif_data, mode='common')
-            
-            self.assertEqual(output1, output2)
-        except Exception as e:
-            if 'exiftool' in str(e).lower():
-                self.skipTest("exiftool not available")
-            raise
+        """Test common mode asks for the common tags"""
+        self.set_output('Make : Canon\n')
+        
+        output = self.capture(show_common_tags, [self.test_image])
+        
+        self.assertIn('Make : Canon', output)
+        args = self.exiftool_args()
+        self.assertIn('-DateTimeOriginal', args)
+        self.assertNotIn('-G', args)
+        self.assertNotIn('-s3', args)
+    
+    def test_display_mode_grouped_without_filenames(self):
+        """Test grouped mode adds -G and hiding filenames adds -s3"""
+        self.capture(show_common_tags, [self.test_image], grouped=True, show_filenames=False)
+        
+        args = self.exiftool_args()
+        self.assertIn('-G', args)
+        self.assertIn('-s3', args)
+    
+    def test_display_mode_gps_no_data(self):
+        """Test GPS mode says so when there is no location data"""
+        output = self.capture(show_gps_tags, [self.test_image])
+        
+        self.assertIn('No GPS/location data found', output)
+        self.assertIn('-GPS:all', self.exiftool_args())
+    
+    def test_display_mode_keywords_no_data(self):
+        """Test keyword mode says so when there are no keywords"""
+        output = self.capture(show_keywords, [self.test_image])
+        
+        self.assertIn('No keywords/captions found', output)
+    
+    def test_display_mode_specific(self):
+        """Test specific tags are prefixed with '-' once"""
+        self.capture(show_specific_tags, [self.test_image], ['Make', '-Model'])
+        
+        self.assertEqual(self.exiftool_args(), ['exiftool', '-Make', '-Model', self.test_image])
+    
+    def test_json_pretty(self):
+        """Test pretty JSON is re-indented"""
+        self.set_output('[{"SourceFile": "test.jpg", "Make": "Canon"}]')
+        
+        output = self.capture(show_json, [self.test_image])
+        
+        self.assertIn('\n  {\n', output)
+        self.assertIn('"Make": "Canon"', output)
+    
+    def test_json_pretty_invalid_output_printed_as_is(self):
+        """Test output that is not JSON is printed unchanged"""
+        self.set_output('not json')
+        
+        output = self.capture(show_json, [self.test_image])
+        
+        self.assertEqual(output, 'not json\n')
+    
+    def capture_bytes(self, func, *args, **kwargs):
+        """Call ``func`` and return the bytes it wrote to stdout"""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with patch('sys.stdout', stdout):
+            func(*args, **kwargs)
+        stdout.flush()
+        return stdout.buffer.getvalue()
+    
+    def test_json_minified(self):
+        """Test minified JSON is one line, read with -struct as bytes"""
+        self.set_output(b'[{"SourceFile": "test.jpg",\n  "Make": "Canon"}]')
+        
+        output = self.capture_bytes(show_json, [self.test_image], output_format='minified')
+        
+        self.assertEqual(json.loads(output), [{"SourceFile": "test.jpg", "Make": "Canon"}])
+        self.assertEqual(output.count(b'\n'), 1)
+        self.assertTrue(output.endswith(b'\n'))
+        self.assertIn('-struct', self.exiftool_args())
+        self.assertFalse(self.mock_run.call_args[1]['text'])
+    
+    def test_json_minified_invalid_output_exits(self):
+        """Test output that is not JSON is an error, not passed through"""
+        self.set_output(b'not json')
+        
+        stderr = StringIO()
+        with redirect_stderr(stderr), self.assertRaises(SystemExit) as cm:
+            self.capture_bytes(show_json, [self.test_image], output_format='minified')
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn('did not return valid JSON', stderr.getvalue())
+        self.assertIn('not json', stderr.getvalue())
+    
+    def test_json_msgpack(self):
+        """Test msgpack output is the packed exiftool data"""
+        self.set_output(b'[{"SourceFile": "test.jpg", "Make": "Canon"}]')
+        mock_msgpack = MagicMock()
+        mock_msgpack.packb.return_value = b'\x91\x82packed'
+        
+        with patch('show_exif.MSGPACK_AVAILABLE', True), \
+                patch('show_exif.msgpack', mock_msgpack, create=True):
+            output = self.capture_bytes(show_json, [self.test_image], output_format='msgpack')
+        
+        self.assertEqual(output, b'\x91\x82packed')
+        mock_msgpack.packb.assert_called_once_with(
+            [{"SourceFile": "test.jpg", "Make": "Canon"}], use_bin_type=True)
+    
+    def test_json_msgpack_unavailable_exits_before_exiftool(self):
+        """Test a missing msgpack package is reported without running exiftool"""
+        stderr = StringIO()
+        with patch('show_exif.MSGPACK_AVAILABLE', False), redirect_stderr(stderr), \
+                self.assertRaises(SystemExit) as cm:
+            show_json([self.test_image], output_format='msgpack')
+        
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn('pip install msgpack', stderr.getvalue())
+        self.mock_run.assert_not_called()
+    
+    def test_main_json_format_with_compact_flag(self):
+        """Test --json-format selects the JSON encoding and -c still parses"""
+        self.set_output(b'[{"Make": "Canon"}]')
+        argv = ['show_exif.py', '--file', self.test_image, '--mode', 'json',
+                '--json-format', 'minified', '-c']
+        
+        with patch('sys.argv', argv):
+            output = self.capture_bytes(show_exif.main)
+        
+        self.assertEqual(json.loads(output), [{"Make": "Canon"}])
+    
+    def test_write_thumbnail(self):
+        """Test thumbnail bytes, whole or in fragments, replace the file"""
+        output_file = os.path.join(self.test_dir, 'thumb.jpg')
+        with open(output_file, 'wb') as f:
+            f.write(b'old contents that are longer')
+        
+        show_exif.write_thumbnail(output_file, _JPEG_STUB)
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read(), _JPEG_STUB)
+        
+        show_exif.write_thumbnail(output_file, _JPEG_STUB[:4], _JPEG_STUB[4:])
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read(), _JPEG_STUB)
+    
+    def test_extract_thumbnails_saves_exiftool_output(self):
+        """Test the -ThumbnailImage bytes are saved as thumb_<name>"""
+        self.set_output(_JPEG_STUB)
+        output_dir = os.path.join(self.test_dir, 'thumbs')
+        
+        output = self.capture(show_exif.extract_thumbnails, [self.test_image], output_dir)
+        
+        self.assertEqual(self.mock_run.call_args_list[0][0][0],
+                         ['exiftool', '-b', '-ThumbnailImage', self.test_image])
+        with open(os.path.join(output_dir, 'thumb_test.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), _JPEG_STUB)
+        self.assertIn('Extracted 1 thumbnail(s)', output)
+    
+    def test_open_in_file_manager_detaches(self):
+        """Test the file manager is started detached and not waited on"""
+        with patch('show_exif._OPEN_CMD', 'xdg-open'), \
+                patch('show_exif.subprocess.Popen') as mock_popen:
+            show_exif.open_in_file_manager(self.test_dir)
+        
+        mock_popen.assert_called_once()
+        self.assertEqual(mock_popen.call_args[0][0], ['xdg-open', self.test_dir])
+        self.assertTrue(mock_popen.call_args[1]['start_new_session'])
+        mock_popen.return_value.wait.assert_not_called()
+    
+    def test_open_in_file_manager_unsupported_platform(self):
+        """Test nothing is started when the platform has no opener"""
+        with patch('show_exif._OPEN_CMD', None), \
+                patch('show_exif.subprocess.Popen') as mock_popen:
+            show_exif.open_in_file_manager(self.test_dir)
+        
+        mock_popen.assert_not_called()
+    
+    def test_open_in_file_manager_failure_reported(self):
+        """Test a missing opener is reported, not raised"""
+        stderr = StringIO()
+        with patch('show_exif._OPEN_CMD', 'xdg-open'), \
+                patch('show_exif.subprocess.Popen', side_effect=FileNotFoundError('xdg-open')), \
+                redirect_stderr(stderr):
+            show_exif.open_in_file_manager(self.test_dir)
+        
+        self.assertIn(f'Could not open {self.test_dir}', stderr.getvalue())
+    
+    def test_extract_thumbnails_open_when_done(self):
+        """Test the output directory is opened only if a thumbnail was saved"""
+        output_dir = os.path.join(self.test_dir, 'thumbs')
+        for stdout, opened in ((_JPEG_STUB, True), (b'', False)):
+            with self.subTest(opened=opened):
+                self.set_output(stdout)
+                with patch('show_exif.open_in_file_manager') as mock_open:
+                    self.capture(show_exif.extract_thumbnails, [self.test_image], output_dir,
+                                 open_when_done=True)
+                
+                if opened:
+                    mock_open.assert_called_once_with(output_dir)
+                else:
+                    mock_open.assert_not_called()
 
 
 if __name__ == '__main__':